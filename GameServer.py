@@ -0,0 +1,274 @@
+'''
+Purpose: Asyncio game server that lets clients play against the agents over TCP, with many games sharing one event loop.
+Protocol: every message is one JSON object on its own line, and every request may carry an "id" that is echoed back in its response.
+    - {"op": "new", "dim": 3, "agent": "alphabeta", "player": 1}: starts a game against the agent, where player is the seat of the client
+    - {"op": "move", "game": gameId, "pos": [row, col]}: plays a move for the client and answers with the move of the agent
+    - {"op": "state", "game": gameId}: returns the current state of a game
+    - {"op": "close", "game": gameId}: ends a game early
+    Responses have "ok": true and the state of the game ("game", "cells", "turn", "over", "outcome" and "agentMove"),
+    or "ok": false and an "error" message. Finished games are removed from the server.
+'''
+import sys, os, asyncio, json, itertools, multiprocessing, signal
+from concurrent.futures import ProcessPoolExecutor
+sys.path.append(os.path.abspath("src"))
+from Board import *
+from Agent import *
+from AgentRegistry import *
+
+INLINE_AGENTS = {"random", "simple"} # cheap enough to play on the event loop, every other agent plays in the executor
+
+_agents = {}
+
+def agent_move(agentName, pNum, board, curRound):
+    '''
+    Purpose: Returns the move of an agent, reusing one agent per (name, seat, dimension) in each process so that caches such as transposition tables persist.
+    '''
+    key = (agentName, pNum, board.dim)
+    if(key not in _agents):
+        _agents[key] = make_agent(agentName, pNum, board.dim)
+    return _agents[key].get_position(board, curRound)
+
+class GameSession():
+    '''
+    Purpose: Class that holds the state of one game between a client and an agent.
+    Attributes:
+        - gameId: integer value that identifies the game on the server
+        - board: the board of the game
+        - agentName: name of the agent (a key of AGENTS)
+        - clientPNum: the seat of the client (the agent plays the other one)
+        - curRound: the round of the next move
+        - lock: asyncio lock that makes the moves of a game run one at a time
+    '''
+    def __init__(self, gameId, dim, agentName, clientPNum):
+        self.gameId = gameId
+        self.board = Board(dim)
+        self.agentName = agentName
+        self.clientPNum = clientPNum
+        self.curRound = 1
+        self.lock = asyncio.Lock()
+
+    def turn(self):
+        return 2 - self.curRound%2
+
+    def is_over(self):
+        return self.board.check_win() or self.board.is_auto_tie() or self.board.is_full()
+
+    def state(self):
+        '''
+        Purpose: Returns the state of the game in the format of the protocol.
+        '''
+        board = self.board
+        cells = "".join("x" if (board.xBits >> idx) & 1 else ("o" if (board.oBits >> idx) & 1 else ".") for idx in range(board.dim*board.dim))
+        over = self.is_over()
+        return {"game": self.gameId, "cells": cells, "turn": self.turn(), "over": over, "outcome": board.game_state() if over else None}
+
+class SessionManager():
+    '''
+    Purpose: Class that runs many games in one asyncio event loop and serves them over TCP (see the protocol in the module docstring).
+    Attributes:
+        - executor: optional concurrent.futures executor that the moves of the slow agents run in (default is a ProcessPoolExecutor)
+        - maxSessions: integer value that specifies the number of games that may be open at once
+        - sessions: dictionary that maps a game id to its GameSession
+    Note: Every request runs as its own task, so a slow agent move only delays the game it belongs to.
+    '''
+    def __init__(self, executor = None, maxSessions = 100000):
+        self.executor = executor if executor is not None else ProcessPoolExecutor(mp_context = multiprocessing.get_context("spawn"))
+        self.maxSessions = maxSessions
+        self.sessions = {}
+        self.gameIds = itertools.count(1)
+
+    async def play_agent(self, session):
+        '''
+        Purpose: Plays the move of the agent of a game and returns it.
+        '''
+        agentPNum = session.clientPNum%2+1
+        if(session.agentName in INLINE_AGENTS):
+            pos = agent_move(session.agentName, agentPNum, session.board, session.curRound)
+        else:
+            board = session.board.copy()
+            pos = await asyncio.get_running_loop().run_in_executor(self.executor, agent_move, session.agentName, agentPNum, board, session.curRound)
+        session.board.update(agentPNum, tuple(pos))
+        session.curRound += 1
+        return list(pos)
+
+    async def new_game(self, dim = 3, agent = "random", player = 1):
+        if(len(self.sessions) >= self.maxSessions):
+            msg = "The server is full."
+            raise Exception(msg)
+        if(player not in [1, 2] or not (isinstance(dim, int) and 1 <= dim <= 10)):
+            msg = "The player has to be 1 or 2 and the dimension between 1 and 10."
+            raise Exception(msg)
+        if(not supports(agent, dim)):
+            msg = "The " + str(agent) + " agent cannot play on a board of dimension " + str(dim) + "."
+            raise Exception(msg)
+        make_agent(agent, 1, dim) # fails early for unknown agents
+        session = GameSession(next(self.gameIds), dim, agent, player)
+        self.sessions[session.gameId] = session
+        agentMove = None
+        async with session.lock:
+            if(player == 2):
+                try:
+                    agentMove = await self.play_agent(session)
+                except Exception:
+                    self.sessions.pop(session.gameId, None) # the id never reaches the client, so nobody could close the game
+                    raise
+        return self.finish(session, agentMove)
+
+    async def move(self, game, pos):
+        session = self.get_session(game)
+        async with session.lock:
+            if(session.is_over() or session.turn() != session.clientPNum):
+                msg = "It is not the turn of the client."
+                raise Exception(msg)
+            if(not (isinstance(pos, list) and all(isinstance(coordinate, int) for coordinate in pos))):
+                msg = "The position has to be a list of the form [row, col]."
+                raise Exception(msg)
+            session.board.update(session.clientPNum, tuple(pos))
+            session.curRound += 1
+            agentMove = None
+            if(not session.is_over()):
+                try:
+                    agentMove = await self.play_agent(session)
+                except Exception:
+                    # take the move of the client back, so that the game is not left waiting on the agent
+                    session.board.pop()
+                    session.curRound -= 1
+                    raise
+        return self.finish(session, agentMove)
+
+    def finish(self, session, agentMove):
+        '''
+        Purpose: Builds the response of a request and removes the game if it is over.
+        '''
+        response = session.state()
+        response["agentMove"] = agentMove
+        if(response["over"]):
+            self.sessions.pop(session.gameId, None)
+        return response
+
+    def get_session(self, game):
+        if(game not in self.sessions):
+            msg = "There is no open game " + str(game) + "."
+            raise Exception(msg)
+        return self.sessions[game]
+
+    async def handle_request(self, request, ownedGames = None):
+        '''
+        Purpose: Runs one request and returns its response (errors are reported in the response instead of being raised).
+        Inputs:
+            - ownedGames: optional set that the id of a new game is added to
+        '''
+        try:
+            op = request.get("op")
+            if(op == "new"):
+                response = await self.new_game(request.get("dim", 3), request.get("agent", "random"), request.get("player", 1))
+                if(ownedGames is not None):
+                    ownedGames.add(response["game"])
+            elif(op == "move"):
+                response = await self.move(request.get("game"), request.get("pos"))
+            elif(op == "state"):
+                response = self.get_session(request.get("game")).state()
+            elif(op == "close"):
+                response = self.get_session(request.get("game")).state()
+                self.sessions.pop(request.get("game"), None)
+            else:
+                msg = "Unknown operation " + str(op) + "."
+                raise Exception(msg)
+            response["ok"] = True
+        except Exception as e:
+            response = {"ok": False, "error": str(e)}
+        if("id" in request):
+            response["id"] = request["id"]
+        return response
+
+    async def handle_client(self, reader, writer):
+        '''
+        Purpose: Serves one TCP connection until the client disconnects, and then removes the games it started.
+        '''
+        tasks = set()
+        ownedGames = set()
+        async def respond(request):
+            response = await self.handle_request(request, ownedGames)
+            writer.write((json.dumps(response) + "\n").encode())
+        try:
+            while(True):
+                line = await reader.readline()
+                if(not line):
+                    break
+                try:
+                    request = json.loads(line)
+                    if(not isinstance(request, dict)):
+                        raise ValueError()
+                except ValueError:
+                    writer.write((json.dumps({"ok": False, "error": "Every request has to be a JSON object on its own line."}) + "\n").encode())
+                    continue
+                task = asyncio.create_task(respond(request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                await writer.drain()
+            if(tasks):
+                await asyncio.gather(*tasks)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for game in ownedGames:
+                self.sessions.pop(game, None)
+            writer.close()
+
+    async def serve(self, host = "127.0.0.1", port = 8765):
+        '''
+        Purpose: Starts the TCP server and returns the asyncio server object (port 0 picks a free port).
+        '''
+        return await asyncio.start_server(self.handle_client, host, port, limit = 2**16)
+
+    def close(self):
+        self.executor.shutdown()
+
+class GameClient():
+    '''
+    Purpose: Small client for the protocol, which sends one request at a time and waits for its response.
+    '''
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host = "127.0.0.1", port = 8765):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, **request):
+        self.writer.write((json.dumps(request) + "\n").encode())
+        await self.writer.drain()
+        return json.loads(await self.reader.readline())
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+async def main(host, port, workers):
+    # spawned (not forked) workers do not inherit the listening socket, so the port is freed as soon as the server stops
+    manager = SessionManager(ProcessPoolExecutor(max_workers = workers, mp_context = multiprocessing.get_context("spawn")))
+    server = await manager.serve(host, port)
+    stop = asyncio.Event()
+    for sig in [signal.SIGINT, signal.SIGTERM]:
+        try:
+            asyncio.get_running_loop().add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass # not supported on Windows, where Ctrl+C still stops the server
+    print("Serving games on", host, "port", port)
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        manager.close() # stops the worker processes along with the server
+
+if __name__ == "__main__":
+    '''
+    Usage: python GameServer.py [port] [workers]
+    Agent Options: "random", "simple", "minimax", "alphabeta", "solved", "retrograde" and "mcts" (see TicTacToe.py for a description of each agent)
+    '''
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None # number of processes the slow agents play in (default is one per CPU)
+    asyncio.run(main("127.0.0.1", port, workers))
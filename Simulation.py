@@ -1,8 +1,166 @@
-import sys, os
+import sys, os, random, json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 sys.path.append(os.path.abspath("src"))
 from Board import *
 from Agent import *
+from SearchStats import *
 from GameStateManager import *
+from GameRecords import *
+
+def trial_seed(seed, trialNum):
+    '''
+    Purpose: Returns the seed of the random number generator for a given trial, so that every trial can be reproduced on its own.
+    '''
+    return str(seed) + ":" + str(trialNum)
+
+def run_trials(boardDim, agent1, agent2, seed, trialNums, returnStats = False, batchSize = 1):
+    '''
+    Purpose: Runs the given trials one after the other (this is the work done by each process in a parallel simulation).
+    Note: With a batchSize above 1, the trials are played batchSize at a time in lockstep (see GameStateManager.run_lockstep()),
+        and each batch is seeded from its first trial.
+    Output:
+        - trialData: list of [trialOutcome, trialGamePositionSummary] lists in the order of trialNums
+        - searchStats: only if returnStats is True, list of the SearchStats [agent1Stats, agent2Stats] counted during these trials (None for agents that do not collect stats)
+    '''
+    agentStats = [getattr(agent, "stats", None) for agent in [agent1, agent2]]
+    for agent, stats in zip([agent1, agent2], agentStats):
+        if(stats is not None):
+            agent.stats = SearchStats() # counts only these trials, and is added back to the agent's totals below
+    trialData = []
+    board = Board(boardDim)
+    GSM = GameStateManager(board, agent1, agent2)
+    moves = move_buffer(boardDim)
+    positions = cell_positions(boardDim)
+    trialNums = list(trialNums)
+    for start in range(0, len(trialNums), batchSize):
+        if(seed is not None):
+            random.seed(trial_seed(seed, trialNums[start]))
+        if(batchSize > 1):
+            trialData.extend(GSM.run_lockstep(len(trialNums[start:start+batchSize])))
+            continue
+        board.clear() # the board and the move buffer are reused by every trial
+        trialOutcome, numMoves = GSM.run_headless(moves)
+        trialGamePositionSummary = {curRound: positions[moves[curRound-1]] for curRound in range(1, numMoves+1)}
+        trialData.append([trialOutcome, trialGamePositionSummary])
+    searchStats = [None, None]
+    for i, (agent, stats) in enumerate(zip([agent1, agent2], agentStats)):
+        if(stats is not None):
+            searchStats[i] = agent.stats
+            agent.stats = stats.merge(searchStats[i])
+    if(returnStats):
+        return trialData, searchStats
+    return trialData
+
+def exact_outcome_distribution(agent1, agent2, dim = 3):
+    '''
+    Purpose: Computes the exact probabilities of each outcome of a game between two agents, by taking the expectation over the game tree instead of sampling games.
+    Inputs:
+        - agent1, agent2: agents that act as player 1 and player 2 (each must be deterministic or implement move_distribution())
+        - dim: integer value that specifies the dimensions of the board
+    Output:
+        - outcomeDistribution: list of Fractions [pP1Wins, pP2Wins, pTies] in the same order as Simulation.outcome_summary()
+    Note: Games end on a win or a forced tie, as in GameStateManager.run_trial(). Each position is only expanded once.
+    '''
+    board = Board(dim)
+    memo = {}
+
+    def expected_outcome(curRound):
+        key = (board.xBits, board.oBits)
+        if(key in memo):
+            return memo[key]
+        gameState = board.game_state()
+        if(gameState == 1):
+            outcome = (Fraction(1), Fraction(0), Fraction(0))
+        elif(gameState == -1):
+            outcome = (Fraction(0), Fraction(1), Fraction(0))
+        elif(board.is_auto_tie()):
+            outcome = (Fraction(0), Fraction(0), Fraction(1))
+        else:
+            if(curRound%2 == 1):
+                agent, pNum = agent1, 1
+            else:
+                agent, pNum = agent2, 2
+            pP1Wins, pP2Wins, pTies = Fraction(0), Fraction(0), Fraction(0)
+            for pos, prob in agent.move_distribution(board, curRound):
+                board.push(pNum, pos)
+                childP1Wins, childP2Wins, childTies = expected_outcome(curRound+1)
+                board.pop()
+                pP1Wins += prob*childP1Wins
+                pP2Wins += prob*childP2Wins
+                pTies += prob*childTies
+            outcome = (pP1Wins, pP2Wins, pTies)
+        memo[key] = outcome
+        return outcome
+
+    return list(expected_outcome(1))
+
+class OutcomeAggregator():
+    '''
+    Purpose: Class that keeps running win, loss and tie counts as trials arrive, so a simulation can be summarized without storing it.
+    Attributes:
+        - numP1Wins: number of trials won by player 1
+        - numP2Wins: number of trials won by player 2
+        - numTies: number of trials that ended in a tie
+    '''
+    def __init__(self):
+        self.numP1Wins = 0
+        self.numP2Wins = 0
+        self.numTies = 0
+
+    def add(self, trialData):
+        '''
+        Purpose: Counts the outcome of one [trialOutcome, trialGamePositionSummary] entry.
+        '''
+        outcome = trialData[0]
+        if(outcome == 1):
+            self.numP1Wins += 1
+        elif(outcome == -1):
+            self.numP2Wins += 1
+        else:
+            self.numTies += 1
+
+    def num_trials(self):
+        return self.numP1Wins + self.numP2Wins + self.numTies
+
+    def summary(self):
+        '''
+        Purpose: Returns the counts in the [numP1Wins, numP2Wins, numTies] format of Simulation.outcome_summary().
+        '''
+        return [self.numP1Wins, self.numP2Wins, self.numTies]
+
+class JSONLSink():
+    '''
+    Purpose: Class that appends every trial it is given to a JSON Lines file, one {"trial", "outcome", "moves"} object per line.
+    Attributes:
+        - path: path of the file (trials are appended to it if it already exists)
+    '''
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "a")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excInfo):
+        self.close()
+
+    def write(self, trialNum, trialData):
+        trialOutcome, trialGamePositionSummary = trialData
+        moves = [[round, pos[0], pos[1]] for round, pos in trialGamePositionSummary.items()]
+        self.file.write(json.dumps({"trial": trialNum, "outcome": trialOutcome, "moves": moves}) + "\n")
+
+    def close(self):
+        self.file.close()
+
+def read_jsonl_trials(path):
+    '''
+    Purpose: Lazily reads a file written by JSONLSink back into [trialOutcome, trialGamePositionSummary] entries.
+    '''
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            yield [record["outcome"], {round: (row, col) for round, row, col in record["moves"]}]
 
 class Simulation():
     '''
@@ -12,36 +170,105 @@ class Simulation():
         - agent1: is an agent object that will act as player 1 (default is the random agent)
         - agent2: is an agent object that will act as player 2 (default is the random agent)
         - sampleSize: integer value that specifies the number of samples that the simulation will go over (default is 1)
+        - workers: integer value that specifies the number of processes the trials are split across (default is 1)
+        - seed: optional seed that makes the simulation reproducible (each trial is seeded from it, so the results do not depend on workers)
+        - batchSize: integer value that specifies how many trials are played side by side, so that the agents can pick their moves for all of them at once (default is 1)
+            - the sampled games depend on batchSize, since batched agents draw their random numbers differently
+        - searchStats: list of the SearchStats [agent1Stats, agent2Stats] of the last run, summed over every worker (None for agents created without collectStats)
     Note: Possible agent choices can be found in the Agent.py file
+    Note: With more than one worker, each process plays with its own copy of the agents (e.g. transposition tables are not shared).
     '''
-    def __init__(self, boardDim = 3, agent1 = RandomAgent(1), agent2 = RandomAgent(2), sampleSize = 1):
+    def __init__(self, boardDim = 3, agent1 = RandomAgent(1), agent2 = RandomAgent(2), sampleSize = 1, workers = 1, seed = None, batchSize = 1):
         self.boardDim = boardDim
         self.agent1 = agent1
         self.agent2 = agent2
         self.sampleSize = sampleSize
+        self.workers = workers
+        self.seed = seed
+        self.batchSize = batchSize
+        self.searchStats = [None, None]
 
     def run_simulation(self):
         '''
         Purpose: Function that runs the simulations and returns the data.
         '''
         simData = []
-        num = 1
-        for trialNum in range(self.sampleSize):
-            print("Trial Number:", num)
-            board = Board(self.boardDim)
-            GSM = GameStateManager(board, self.agent1, self.agent2)
-            trialOutcome, trialGamePositionSummary = GSM.run_trial()
-            simData.append([trialOutcome, trialGamePositionSummary])
-            num += 1
+        for trialData in self.iter_trials(verbose = True):
+            simData.append(trialData)
         return simData
 
-    def trial_visualizer(self, trialData):
+    def iter_trials(self, verbose = False, sink = None):
+        '''
+        Purpose: Generator that runs the simulation lazily and yields one [trialOutcome, trialGamePositionSummary] entry per trial, in trial order.
+        Inputs:
+            - verbose: if True, prints the trial number of every trial as it is yielded
+            - sink: optional object with a write(trialNum, trialData) method (e.g. a JSONLSink) that every trial is written to
+        '''
+        num = 1
+        for trialData in self.trial_batches():
+            for data in trialData:
+                if(verbose):
+                    print("Trial Number:", num)
+                if(sink is not None):
+                    sink.write(num, data)
+                yield data
+                num += 1
+
+    def trial_batches(self):
+        '''
+        Purpose: Generator that yields the trials in order as lists of trial data, running them in worker processes when workers is more than 1.
+        Note: Only a bounded number of batches is in flight at a time, so memory use does not grow with sampleSize.
+        '''
+        self.searchStats = [SearchStats() if getattr(agent, "stats", None) is not None else None for agent in [self.agent1, self.agent2]]
+        if(self.workers <= 1):
+            for start in range(0, self.sampleSize, self.batchSize):
+                trialNums = range(start, min(start+self.batchSize, self.sampleSize))
+                yield self.add_search_stats(*run_trials(self.boardDim, self.agent1, self.agent2, self.seed, trialNums, True, self.batchSize))
+            return
+
+        seed = self.seed
+        if(seed is None):
+            seed = random.randrange(2**32)
+        chunkSize = max(1, min(1000, -(-self.sampleSize//(4*self.workers)))) # a few chunks per worker to balance uneven games
+        chunkSize = -(-chunkSize//self.batchSize)*self.batchSize # whole batches, so the games do not depend on workers
+        chunks = (range(start, min(start+chunkSize, self.sampleSize)) for start in range(0, self.sampleSize, chunkSize))
+        with ProcessPoolExecutor(max_workers = self.workers) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(run_trials, self.boardDim, self.agent1, self.agent2, seed, chunk, True, self.batchSize))
+                if(len(pending) >= 2*self.workers):
+                    yield self.add_search_stats(*pending.popleft().result()) # results come back in trial order
+            while(pending):
+                yield self.add_search_stats(*pending.popleft().result())
+
+    def add_search_stats(self, trialData, searchStats):
+        '''
+        Purpose: Adds the SearchStats returned by run_trials() to the totals of the simulation and passes the trial data on.
+        '''
+        for i, stats in enumerate(searchStats):
+            if(stats is not None and self.searchStats[i] is not None):
+                self.searchStats[i].merge(stats)
+        return trialData
+
+    def record_sink(self, path):
+        '''
+        Purpose: Returns a GameRecordSink (see GameRecords.py) for the board dimension and agents of the simulation, to be passed as the sink of iter_trials().
+        '''
+        return GameRecordSink(path, self.boardDim, [str(self.agent1), str(self.agent2)])
+
+    def trial_visualizer(self, trialData, recordPath = None):
         '''
         Purpose: Allows one to visualize a particular round of from the simulation data from run_simulation().
+        Note: If recordPath is given, trialData is the number of a trial (starting at 1) in that game record file instead, and only that trial is read from it.
         '''
+        dim = self.boardDim
+        if(recordPath is not None):
+            with GameRecordReader(recordPath) as reader:
+                dim = reader.dim
+                trialData = reader[trialData-1]
         trialOutcome = trialData[0]
         trialGamePositionSummary = trialData[1]
-        b = Board(self.boardDim)
+        b = Board(dim)
         roundNum = 0
         for round in trialGamePositionSummary:
             roundNum += 1
@@ -64,25 +291,21 @@ class Simulation():
         else:
             print("Trial Outcome: Tie")
 
+    def exact_outcome_summary(self):
+        '''
+        Purpose: Returns the exact [pP1Wins, pP2Wins, pTies] probabilities of the simulated matchup (see exact_outcome_distribution()), which sampling with run_simulation() only estimates.
+        '''
+        return exact_outcome_distribution(self.agent1, self.agent2, self.boardDim)
+
     def outcome_summary(self, simulationData):
         '''
         Purpose: Summarizes the number of times that the trial resulted in player 1 winning, player 2 winning, or both players coming to a tie.
+        Note: simulationData can be any iterable of trial data, including the generator returned by iter_trials().
         '''
-        outcomeData = []
+        aggregator = OutcomeAggregator()
         for d in simulationData:
-            outcomeData.append(d[0])
-        numP1Wins = 0
-        numP2Wins = 0
-        numTies = 0
-        numTrials = len(outcomeData)
-        for outcome in outcomeData:
-            if(outcome == 1):
-                numP1Wins += 1
-            elif(outcome == -1):
-                numP2Wins += 1
-            else:
-                numTies += 1
-        outcomeSummary = [numP1Wins, numP2Wins, numTies]
+            aggregator.add(d)
+        outcomeSummary = aggregator.summary()
         return outcomeSummary
 
 if __name__ == "__main__":
@@ -93,22 +316,43 @@ if __name__ == "__main__":
     - SimpleAgent(): Agent that implements a very simple heuristic by looking to see if it could currently win or is about to lose
     - MiniMaxAgent(): Agent that implements the minimax algorithm w/o alpha beta pruning (very slow and should probably avoid)
     - AlphaBetaMiniMaxAgent(): Agent that implements the minimax algorithm with alpha beta pruning (should use over the other implementation)
+    - SolvedTableAgent(): Agent that plays perfectly on 3x3 boards by looking its moves up in a table that is solved once and cached on disk (fastest option)
+    - RetrogradeAgent(): Agent that plays perfectly on 3x3 and 4x4 boards by looking its moves up in a packed table built by a retrograde solver (needs NumPy to build the table)
+    - MCTSAgent(): Agent that uses Monte Carlo tree search with random playouts (scales to larger boards, configurable numPlayouts or timeLimit)
     Note: ALL agents require for you to specify a pNum attribute (1 is for p1 and 2 is for p2)
     '''
     # Example Usage of the tools provided by the Simulation class
     print("= = = = = = = = = Tic-tac-toe Simulation = = = = = = = = = \n")
-    agent1 = AlphaBetaMiniMaxAgent(pNum = 1)
+    agent1 = AlphaBetaMiniMaxAgent(pNum = 1, collectStats = True)
     agent2 = RandomAgent(pNum = 2)
     boardDim = 3
     sampleSize = 100
-    sim = Simulation(boardDim, agent1, agent2, sampleSize)
+    workers = 1 # number of processes to split the trials across
+    seed = None # set to an integer to make the simulation reproducible
+    sim = Simulation(boardDim, agent1, agent2, sampleSize, workers, seed)
     simData = sim.run_simulation()
     # Uncomment the following section if you wish to visualize the trials
     '''
     for trialData in simData:
         sim.trial_visualizer(trialData)
     '''
+    # Uncomment the following section to stream the trials into a compact game record file and replay one of them from it
+    '''
+    with sim.record_sink("trials.bin") as sink:
+        for trialData in sim.iter_trials(sink = sink):
+            pass
+    sim.trial_visualizer(1, recordPath = "trials.bin")
+    '''
     outcomeSummary = sim.outcome_summary(simData)
     print("Number of Player 1 Wins: ", outcomeSummary[0])
     print("Number of Player 2 Wins: ", outcomeSummary[1])
     print("Number of Ties: ", outcomeSummary[2])
+    # Work done by the search agents (create them with collectStats = True to count it)
+    for pNum, stats in enumerate(sim.searchStats, 1):
+        if(stats is not None):
+            print("Player", pNum, "Search Stats: ", stats)
+    # Exact outcome probabilities of the same matchup (computed in one pass over the game tree)
+    exactSummary = sim.exact_outcome_summary()
+    print("Probability of a Player 1 Win: ", float(exactSummary[0]))
+    print("Probability of a Player 2 Win: ", float(exactSummary[1]))
+    print("Probability of a Tie: ", float(exactSummary[2]))
@@ -23,11 +23,14 @@ if __name__ == "__main__":
     - SimpleAgent(): Agent that implements a very simple heuristic by looking to see if it could currently win or is about to lose
     - MiniMaxAgent(): Agent that implements the minimax algorithm w/o alpha beta pruning (very slow and should probably avoid)
     - AlphaBetaMiniMaxAgent(): Agent that implements the minimax algorithm with alpha beta pruning (should use over the other implementation)
+    - SolvedTableAgent(): Agent that plays perfectly on 3x3 boards by looking its moves up in a table that is solved once and cached on disk (fastest option)
+    - RetrogradeAgent(): Agent that plays perfectly on 3x3 and 4x4 boards by looking its moves up in a packed table built by a retrograde solver (needs NumPy to build the table)
+    - MCTSAgent(): Agent that uses Monte Carlo tree search with random playouts (scales to larger boards, configurable numPlayouts or timeLimit)
     Note: ALL agents require for you to specify a pNum attribute (1 is for p1 and 2 is for p2)
     '''
     # Editable Parameters
     p1 = Player(pNum = 1)
-    p2 = AlphaBetaMiniMaxAgent(pNum = 2)
+    p2 = AlphaBetaMiniMaxAgent(pNum = 2) # AlphaBetaMiniMaxAgent(pNum = 2, workers = 4) splits its search across 4 processes (useful on 4x4 boards)
     print("= = = = = = = = = = Tic-tac-toe = = = = = = = =\n")
     print("Notes: ")
     print("- Player 1:", p1)
@@ -0,0 +1,232 @@
+'''
+Purpose: Round-robin tournament between the agents, played on several board sizes with both seat orders, with ratings fitted from the results.
+Results File: one JSON object per line for every finished task (a chunk of the games of one pairing), with the keys
+    "agent1", "agent2", "dim", "start", "games", "p1Wins", "p2Wins", "ties" and "seconds". Tasks that are already in the file are
+    skipped, so an interrupted tournament is resumed by running it again with the same results file.
+'''
+import sys, os, json, math, time, random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+sys.path.append(os.path.abspath("src"))
+from Simulation import *
+from AgentRegistry import *
+
+# rough cost of one move of each agent relative to a random move, measured on 3x3 boards (the table agents are
+# cheap once their table is on disk, and minimax without pruning is by far the slowest)
+MOVE_COSTS = {"random": 1, "simple": 1, "solved": 1, "retrograde": 1, "alphabeta": 100, "mcts": 1000, "minimax": 10000}
+
+def task_cost(task):
+    '''
+    Purpose: Returns the estimated cost of a task, which the tasks are ordered by so that the expensive ones start first.
+    '''
+    agent1Name, agent2Name, dim, start, numGames = task
+    return (MOVE_COSTS.get(agent1Name, 1) + MOVE_COSTS.get(agent2Name, 1))*dim*dim*numGames
+
+def play_task(agent1Name, agent2Name, dim, start, numGames, seed, cacheDir = None):
+    '''
+    Purpose: Plays games start to start+numGames of a pairing and returns their result (this is the work done by each process in the tournament).
+    Note: Each game is seeded from the seed, the pairing and its game number, so the results do not depend on how the games are split into tasks.
+    '''
+    startTime = time.perf_counter()
+    matchSeed = str(seed) + ":" + agent1Name + ":" + agent2Name + ":" + str(dim)
+    trialData = run_trials(dim, make_agent(agent1Name, 1, dim, cacheDir), make_agent(agent2Name, 2, dim, cacheDir), matchSeed, range(start, start+numGames))
+    aggregator = OutcomeAggregator()
+    for data in trialData:
+        aggregator.add(data)
+    return {"agent1": agent1Name, "agent2": agent2Name, "dim": dim, "start": start, "games": numGames,
+        "p1Wins": aggregator.numP1Wins, "p2Wins": aggregator.numP2Wins, "ties": aggregator.numTies, "seconds": time.perf_counter() - startTime}
+
+def read_results(path):
+    '''
+    Purpose: Reads the results file of a tournament, skipping a last line that was cut off when the tournament was interrupted.
+    '''
+    results = []
+    if(path is None or not os.path.exists(path)):
+        return results
+    with open(path) as f:
+        for line in f:
+            try:
+                results.append(json.loads(line))
+            except ValueError:
+                pass
+    return results
+
+def drop_partial_line(path):
+    '''
+    Purpose: Cuts off a last line of the results file that was not finished, so that new results start on a line of their own.
+    '''
+    if(path is None or not os.path.exists(path)):
+        return
+    with open(path, "rb+") as f:
+        data = f.read()
+        if(data and not data.endswith(b"\n")):
+            f.truncate(data.rfind(b"\n") + 1)
+
+def fit_ratings(results, prior = 1.0, maxIterations = 10000, tolerance = 1e-10):
+    '''
+    Purpose: Fits Bradley-Terry strengths to the results of a tournament and returns them on the Elo scale.
+    Inputs:
+        - results: list of result dictionaries (see the module docstring), where a tie counts as half a win for both agents
+        - prior: number of virtual games, split evenly, added to every pairing that played (keeps the ratings finite for agents that win or lose every game)
+    Output:
+        - ratings: dictionary that maps every agent name to its Elo rating, where the ratings average 1500
+    Note: The strengths are fitted with the minorization-maximization updates of Hunter (2004), and a strength p becomes the rating 1500 + 400*log10(p).
+    '''
+    wins = {}
+    games = {}
+    for result in results:
+        agent1Name, agent2Name = result["agent1"], result["agent2"]
+        for name in [agent1Name, agent2Name]:
+            wins.setdefault(name, {})
+            games.setdefault(name, {})
+        pair = [(agent1Name, agent2Name, result["p1Wins"]), (agent2Name, agent1Name, result["p2Wins"])]
+        for name, opponent, numWins in pair:
+            wins[name][opponent] = wins[name].get(opponent, 0) + numWins + result["ties"]/2
+            games[name][opponent] = games[name].get(opponent, 0) + result["games"]
+    for name in games:
+        for opponent in games[name]:
+            if(opponent != name):
+                wins[name][opponent] += prior/2
+                games[name][opponent] += prior
+    strengths = {name: 1.0 for name in games}
+    for iteration in range(maxIterations):
+        newStrengths = {}
+        for name in games:
+            totalWins = sum(numWins for opponent, numWins in wins[name].items() if opponent != name)
+            denominator = sum(numGames/(strengths[name] + strengths[opponent]) for opponent, numGames in games[name].items() if opponent != name)
+            newStrengths[name] = totalWins/denominator if denominator > 0 else strengths[name]
+        logMean = sum(math.log(max(strength, 1e-300)) for strength in newStrengths.values())/len(newStrengths)
+        newStrengths = {name: strength/math.exp(logMean) for name, strength in newStrengths.items()}
+        change = max(abs(newStrengths[name] - strengths[name]) for name in strengths)
+        strengths = newStrengths
+        if(change < tolerance):
+            break
+    return {name: 1500 + 400*math.log10(max(strength, 1e-300)) for name, strength in strengths.items()}
+
+class Tournament():
+    '''
+    Purpose: Class that plays every agent against every other one, on each board dimension and in both seat orders, across a pool of processes.
+    Attributes:
+        - agentNames: list of the agents that take part (keys of AgentRegistry.AGENTS, which also sets up their options for larger boards)
+        - dims: list of the board dimensions that every pairing is played on (default is [3])
+        - gamesPerMatch: integer value that specifies the number of games of each pairing and seat order (default is 100)
+        - workers: integer value that specifies the number of processes the tasks are split across (default is 1)
+        - seed: optional seed that makes the tournament reproducible
+        - resultsPath: optional path of the JSON Lines file that the results are appended to and resumed from
+        - taskSize: integer value that specifies the number of games per task (default is 50), so that one slow pairing is spread over several processes
+        - cacheDir: optional directory that the table agents keep their table files in (default is ~/.cache/tictactoe)
+    Note: Pairings that an agent cannot play (e.g. the solved table agent on boards other than 3x3) are left out of the schedule.
+    '''
+    def __init__(self, agentNames = None, dims = None, gamesPerMatch = 100, workers = 1, seed = None, resultsPath = None, taskSize = 50, cacheDir = None):
+        self.agentNames = agentNames if agentNames is not None else list(AGENTS)
+        self.dims = dims if dims is not None else [3]
+        self.gamesPerMatch = gamesPerMatch
+        self.workers = workers
+        self.seed = seed
+        self.resultsPath = resultsPath
+        self.taskSize = taskSize
+        self.cacheDir = cacheDir
+        self.results = []
+
+    def schedule(self):
+        '''
+        Purpose: Returns the (agent1Name, agent2Name, dim) pairings of the tournament, with every pair of agents in both seat orders.
+        '''
+        pairings = []
+        for dim in self.dims:
+            names = [name for name in self.agentNames if supports(name, dim)]
+            for agent1Name in names:
+                for agent2Name in names:
+                    if(agent1Name != agent2Name):
+                        pairings.append((agent1Name, agent2Name, dim))
+        return pairings
+
+    def tasks(self):
+        '''
+        Purpose: Returns the (agent1Name, agent2Name, dim, start, numGames) tasks of the schedule, most expensive first.
+        '''
+        tasks = []
+        for agent1Name, agent2Name, dim in self.schedule():
+            for start in range(0, self.gamesPerMatch, self.taskSize):
+                tasks.append((agent1Name, agent2Name, dim, start, min(self.taskSize, self.gamesPerMatch - start)))
+        return sorted(tasks, key = task_cost, reverse = True)
+
+    def run(self, verbose = False):
+        '''
+        Purpose: Plays every task that is not in the results file yet and returns the results of the whole tournament.
+        Note: Each result is appended to the results file as soon as its task finishes, so an interrupted run only loses the tasks in progress.
+        '''
+        done = {}
+        for result in read_results(self.resultsPath):
+            done[(result["agent1"], result["agent2"], result["dim"], result["start"], result["games"])] = result
+        tasks = self.tasks()
+        self.results = [done[task] for task in tasks if task in done]
+        remaining = [task for task in tasks if task not in done]
+        seed = self.seed
+        if(seed is None):
+            seed = random.randrange(2**32)
+        drop_partial_line(self.resultsPath)
+        resultsFile = open(self.resultsPath, "a") if self.resultsPath is not None else None
+        try:
+            for result in self.play(remaining, seed):
+                self.results.append(result)
+                if(resultsFile is not None):
+                    resultsFile.write(json.dumps(result) + "\n")
+                    resultsFile.flush()
+                if(verbose):
+                    print("Finished", len(self.results), "of", len(tasks), "tasks:", result["agent1"], "vs", result["agent2"], "on", str(result["dim"]) + "x" + str(result["dim"]))
+        finally:
+            if(resultsFile is not None):
+                resultsFile.close()
+        return self.results
+
+    def play(self, tasks, seed):
+        '''
+        Purpose: Generator that plays the tasks and yields their results as they finish, running them in worker processes when workers is more than 1.
+        Note: The tasks are submitted most expensive first, so the cheap ones fill in the gaps at the end instead of one slow task running on its own.
+        '''
+        if(self.workers <= 1):
+            for task in tasks:
+                yield play_task(*task, seed, self.cacheDir)
+            return
+        with ProcessPoolExecutor(max_workers = self.workers) as pool:
+            futures = [pool.submit(play_task, *task, seed, self.cacheDir) for task in tasks]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def ratings(self, dim = None):
+        '''
+        Purpose: Returns the Elo ratings fitted to the results (see fit_ratings()), on one board dimension or on all of them when dim is None.
+        '''
+        return fit_ratings([result for result in self.results if dim is None or result["dim"] == dim])
+
+    def standings(self, dim = None):
+        '''
+        Purpose: Returns a list of [agentName, rating, score, games] rows sorted by rating, where score counts a win as 1 and a tie as half.
+        '''
+        ratings = self.ratings(dim)
+        scores = {name: 0 for name in ratings}
+        games = {name: 0 for name in ratings}
+        for result in self.results:
+            if(dim is None or result["dim"] == dim):
+                scores[result["agent1"]] += result["p1Wins"] + result["ties"]/2
+                scores[result["agent2"]] += result["p2Wins"] + result["ties"]/2
+                games[result["agent1"]] += result["games"]
+                games[result["agent2"]] += result["games"]
+        return sorted([[name, ratings[name], scores[name], games[name]] for name in ratings], key = lambda row: row[1], reverse = True)
+
+if __name__ == "__main__":
+    '''
+    Usage: python Tournament.py [resultsPath] [workers]
+    Agent Options: "random", "simple", "minimax", "alphabeta", "solved", "retrograde" and "mcts" (see TicTacToe.py for a description of each agent)
+    Note: Running it again with the same results file resumes the tournament, and only plays the tasks that are missing from the file.
+    '''
+    resultsPath = sys.argv[1] if len(sys.argv) > 1 else "tournament.jsonl"
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    agentNames = ["random", "simple", "alphabeta", "solved", "mcts"]
+    dims = [3, 4]
+    tournament = Tournament(agentNames, dims, gamesPerMatch = 20, workers = workers, seed = 0, resultsPath = resultsPath, taskSize = 10)
+    tournament.run(verbose = True)
+    for dim in dims + [None]:
+        print("= = = = = = = = = Standings", "(all boards)" if dim is None else "(" + str(dim) + "x" + str(dim) + ")", "= = = = = = = = =")
+        for name, rating, score, numGames in tournament.standings(dim):
+            print(name.ljust(12), str(round(rating)).rjust(6), str(score).rjust(8), "/", numGames)
@@ -1,6 +1,20 @@
-import random
+import random, time, math, multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
 from Board import *
-from copy import deepcopy
+from TranspositionTable import *
+from SolvedTable import default_cache_path, load_table, lookup
+from Retrograde import default_table_path, load_retrograde_table, retrograde_best_move
+from MoveOrdering import *
+from SearchStats import *
+
+MIN_VECTORIZED_BATCH = 32 # smallest batch that RandomAgent and SimpleAgent hand to the NumPy policies (smaller ones are faster in a loop)
+
+class SearchBudgetExceeded(Exception):
+    '''
+    Purpose: Exception raised inside a search when the time or node budget of the current move has been used up.
+    '''
+    pass
 
 class Player():
     '''
@@ -31,6 +45,20 @@ class Player():
             print(board.open_positions())
             return self.get_position(board, curRound)
 
+    def move_distribution(self, board, curRound):
+        '''
+        Purpose: Returns every position the agent may play with the probability that it plays it, as a list of (pos, Fraction) tuples.
+        Note: The default assumes that get_position() is deterministic. Agents that pick moves at random override it, or raise an exception (like the MCTSAgent) when the distribution cannot be computed.
+        '''
+        return [(self.get_position(board, curRound), Fraction(1))]
+
+    def get_positions(self, boards, rounds):
+        '''
+        Purpose: Returns the position the agent plays on each board of a batch, where rounds[i] is the current round of boards[i].
+        Note: The default plays the boards one at a time with get_position(). Agents that can share work across a batch override it.
+        '''
+        return [self.get_position(board, curRound) for board, curRound in zip(boards, rounds)]
+
 class RandomAgent(Player):
     '''
     Purpose: Benchmark for an agent that chooses a random position that is open for play.
@@ -44,6 +72,16 @@ class RandomAgent(Player):
         pos = random.choice(positions)
         return pos
 
+    def move_distribution(self, board, curRound):
+        positions = board.open_positions()
+        return [(pos, Fraction(1, len(positions))) for pos in positions]
+
+    def get_positions(self, boards, rounds):
+        positions = vectorized_positions(boards, self.pNum, "random")
+        if(positions is None):
+            return super().get_positions(boards, rounds)
+        return positions
+
 
 class SimpleAgent(Player):
 
@@ -54,8 +92,7 @@ class SimpleAgent(Player):
     Purpose: A simple agent that plays by winning if it can, or blocking the opponent if they are in a position to win.
     '''
     def get_position(self, board, curRound):
-        winningPositions = board.winning_positions(self.pNum)
-        losingPositions = board.losing_positions(self.pNum)
+        winningPositions, losingPositions = board.threat_positions(self.pNum)
         if(len(winningPositions) > 0):
             return  random.choice(winningPositions)
         elif(len(losingPositions) > 0):
@@ -63,28 +100,53 @@ class SimpleAgent(Player):
         else:
             return random.choice(board.open_positions())
 
+    def move_distribution(self, board, curRound):
+        winningPositions, losingPositions = board.threat_positions(self.pNum)
+        positions = winningPositions
+        if(len(positions) == 0):
+            positions = losingPositions
+        if(len(positions) == 0):
+            positions = board.open_positions()
+        return [(pos, Fraction(1, len(positions))) for pos in positions]
+
+    def get_positions(self, boards, rounds):
+        positions = vectorized_positions(boards, self.pNum, "simple")
+        if(positions is None):
+            return super().get_positions(boards, rounds)
+        return positions
+
 class MiniMaxAgent(Player):
 
     '''
     Purpose: An agent that uses the minimax algorithm in order to play by searching the game tree.
+    Attributes:
+        - maxDepth: optional integer value that limits how many moves ahead the agent searches (positions at the limit are estimated with Board.line_score())
+        - collectStats: if True, the work of every search is counted (see SearchStats.py)
+            - stats: SearchStats summed over every move of the agent (None if collectStats is False)
+            - moveStats: SearchStats of the most recent move
     '''
+    def __init__(self, pNum, maxDepth = None, collectStats = False):
+        super().__init__(pNum)
+        self.maxDepth = maxDepth
+        self.stats = SearchStats() if collectStats else None
+        self.moveStats = None
 
     def __str__(self):
         return "MiniMax Agent"
 
     def value(self, isMaximizing, board):
-        if(isMaximizing):
-            curPNum = self.pNum
-        else:
-            curPNum = self.pNum%2+1
-
-        if(isMaximizing):
-            if((curPNum == 1 and board.game_state() == -1) or (curPNum == 2 and board.game_state() == 1)):
-                return (-1, None)
-        if(not isMaximizing):
-            if((curPNum == 1 and board.game_state() == 1) or (curPNum == 2 and board.game_state() == -1)):
-                return (1, None)
-        return (0, None)
+        gameState = board.game_state()
+        if((self.pNum == 1 and gameState == 1) or (self.pNum == 2 and gameState == -1)):
+            return (1, None) # the agent won
+        if((self.pNum == 1 and gameState == -1) or (self.pNum == 2 and gameState == 1)):
+            return (-1, None) # the opponent won
+        if(board.is_full() or board.is_auto_tie()):
+            return (0, None)
+        # the search was cut off before the end of the game, so the position is estimated from its open lines
+        score = board.line_score()
+        if(self.pNum == 1):
+            return (score, None)
+        return (-score, None)
 
     def minimax(self, depth, isMaximizing, board):
         curPNum = 0
@@ -93,19 +155,29 @@ class MiniMaxAgent(Player):
         else:
             curPNum = self.pNum%2+1
 
-        openPositions = board.open_positions()
-        autoTie = board.is_auto_tie()
+        moveStats = self.moveStats
+        if(moveStats is not None):
+            moveStats.nodes += 1
+            moveStats.maxDepth = max(moveStats.maxDepth, len(board.moveStack) - moveStats.rootPly)
+
         checkWin = board.check_win()
-        if(depth == 0 or checkWin or len(openPositions) == 0):
+        if(not checkWin and board.is_forced_draw(curPNum)):
+            if(moveStats is not None):
+                moveStats.leafEvaluations += 1
+            return (0, None) # no line can be completed anymore (this includes a full board)
+        if(depth == 0 or checkWin):
+            if(moveStats is not None):
+                moveStats.leafEvaluations += 1
             return self.value(isMaximizing, board)
+        openPositions = board.open_positions()
 
         if(isMaximizing == True): # maximizing player
             maxPos = openPositions[0]
             maxVal = -999 # negative infinity
             for pos in openPositions:
-                tempBoard = deepcopy(board)
-                tempBoard.update(curPNum, pos)
-                curNode = self.minimax(depth-1, False, tempBoard)
+                board.push(curPNum, pos)
+                curNode = self.minimax(depth-1, False, board)
+                board.pop()
                 curVal = curNode[0]
                 if(curVal > maxVal):
                     maxVal = curVal
@@ -115,9 +187,9 @@ class MiniMaxAgent(Player):
             minPos = openPositions[0]
             minVal = 999 # positive infinity
             for pos in openPositions:
-                tempBoard = deepcopy(board)
-                tempBoard.update(curPNum, pos)
-                curNode = self.minimax(depth-1, True, tempBoard)
+                board.push(curPNum, pos)
+                curNode = self.minimax(depth-1, True, board)
+                board.pop()
                 curVal = curNode[0]
                 if(curVal < minVal):
                     minVal = curVal
@@ -125,32 +197,82 @@ class MiniMaxAgent(Player):
             return (minVal, minPos)
 
     def get_position(self, board, curRound):
+        if(self.stats is not None):
+            return record_search_stats(self, board, curRound)
+        return self.search(board, curRound)
+
+    def get_positions(self, boards, rounds):
+        return unique_positions(self, boards, rounds)
+
+    def search(self, board, curRound):
         depth = board.dim**2 - curRound +1
+        if(self.maxDepth is not None):
+            depth = min(depth, self.maxDepth)
         bestValue, bestPos = self.minimax(depth, True, board)
+        if(bestPos is None):
+            return board.open_positions()[0] # the game is a forced draw, so every move is as good
         return bestPos
 
 class AlphaBetaMiniMaxAgent(Player):
 
     '''
     Purpose: An agent that employs an improvement to the above agent by applying alpha beta pruning.
+    Attributes:
+        - ttSize: optional integer value that enables a transposition table holding at most this many positions
+            - the table persists across moves and games for the lifetime of the agent
+        - useSymmetry: if True, rotations and reflections of a position share one transposition table entry
+        - timeLimit: optional number of seconds each move may take (enables iterative deepening)
+        - nodeLimit: optional number of nodes each move may search (enables iterative deepening)
+        - moveOrdering: optional MoveOrdering object (see MoveOrdering.py) that decides which moves are searched first
+        - workers: integer value that specifies the number of processes the root moves of a search are split across (default is 1)
+        - maxDepth: optional integer value that limits how many moves ahead the agent searches (positions at the limit are estimated with Board.line_score())
+        - nodesVisited: number of nodes searched over the lifetime of the agent
+        - collectStats: if True, the work of every search is counted (see SearchStats.py)
+            - stats: SearchStats summed over every move of the agent (None if collectStats is False)
+            - moveStats: SearchStats of the most recent move
     '''
+    def __init__(self, pNum, ttSize = None, useSymmetry = False, timeLimit = None, nodeLimit = None, moveOrdering = None, workers = 1, maxDepth = None, collectStats = False):
+        super().__init__(pNum)
+        self.maxDepth = maxDepth
+        self.stats = SearchStats() if collectStats else None
+        self.moveStats = None
+        self.ttSize = ttSize
+        self.workers = workers
+        self.pool = None # process pool of the parallel search, created on first use
+        self.sharedAlpha = None # best root value found so far, shared with the worker processes
+        self.moveOrdering = moveOrdering
+        self.nodesVisited = 0
+        self.useSymmetry = useSymmetry
+        self.transpositionTable = None
+        if(ttSize is not None):
+            self.transpositionTable = TranspositionTable(ttSize)
+        self.timeLimit = timeLimit
+        self.nodeLimit = nodeLimit
+        self.deadline = None # wall-clock time at which the current move has to stop searching
+        self.nodesLeft = None # number of nodes the current move may still search
+        self.moveHints = None # best moves of the previous iteration, used to order the next one
 
     def __str__(self):
         return "Alpha Beta MiniMax Agent"
 
-    def value(self, isMaximizing, board):
-        if(isMaximizing):
-            curPNum = self.pNum
-        else:
-            curPNum = self.pNum%2+1
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["pool"], state["sharedAlpha"] = None, None # process handles cannot be sent to other processes
+        return state
 
-        if(isMaximizing):
-            if((curPNum == 1 and board.game_state() == -1) or (curPNum == 2 and board.game_state() == 1)):
-                return (-1, None)
-        if(not isMaximizing):
-            if((curPNum == 1 and board.game_state() == 1) or (curPNum == 2 and board.game_state() == -1)):
-                return (1, None)
-        return (0, None)
+    def value(self, isMaximizing, board):
+        gameState = board.game_state()
+        if((self.pNum == 1 and gameState == 1) or (self.pNum == 2 and gameState == -1)):
+            return (1, None) # the agent won
+        if((self.pNum == 1 and gameState == -1) or (self.pNum == 2 and gameState == 1)):
+            return (-1, None) # the opponent won
+        if(board.is_full() or board.is_auto_tie()):
+            return (0, None)
+        # the search was cut off before the end of the game, so the position is estimated from its open lines
+        score = board.line_score()
+        if(self.pNum == 1):
+            return (score, None)
+        return (-score, None)
 
     def minimax(self, depth, isMaximizing, board, alpha, beta):
         curPNum = 0
@@ -159,45 +281,529 @@ class AlphaBetaMiniMaxAgent(Player):
         else:
             curPNum = self.pNum%2+1
 
-        openPositions = board.open_positions()
-        autoTie = board.is_auto_tie()
+        self.nodesVisited += 1
+        if(self.deadline is not None or self.nodesLeft is not None):
+            self.check_budget()
+        moveStats = self.moveStats
+        if(moveStats is not None):
+            moveStats.nodes += 1
+            moveStats.maxDepth = max(moveStats.maxDepth, len(board.moveStack) - moveStats.rootPly)
+
         checkWin = board.check_win()
-        if(depth == 0 or checkWin or len(openPositions) == 0):
+        if(not checkWin and board.is_forced_draw(curPNum)):
+            if(moveStats is not None):
+                moveStats.leafEvaluations += 1
+            return (0, None) # no line can be completed anymore (this includes a full board)
+        if(depth == 0 or checkWin):
+            if(moveStats is not None):
+                moveStats.leafEvaluations += 1
             return self.value(isMaximizing, board)
+        openPositions = board.open_positions()
+
+        moveOrdering = self.moveOrdering
+        if(moveOrdering is not None):
+            ply = len(board.moveStack)
+            openPositions = moveOrdering.order(board, openPositions, curPNum, ply)
+
+        # Previous Iteration Best Move
+        moveHints = self.moveHints
+        if(moveHints is not None):
+            hintKey = (hash(board), isMaximizing)
+            hintPos = moveHints.get(hintKey)
+            if(hintPos is not None):
+                openPositions.remove(hintPos)
+                openPositions.insert(0, hintPos)
+
+        # Transposition Table Lookup
+        table = self.transpositionTable
+        if(table is not None):
+            if(self.useSymmetry):
+                canonicalKey, transform = board.canonical_key()
+                key = (board.dim, canonicalKey, isMaximizing) # the bitmasks alone are shared by boards of different dimensions
+            else:
+                key, transform = (hash(board), isMaximizing), 0
+            entry = table.lookup(key)
+            if(moveStats is not None):
+                moveStats.cacheLookups += 1
+                moveStats.cacheHits += (entry is not None)
+            if(entry is not None):
+                entryDepth, entryValue, entryBound, entryPos = entry
+                entryPos = board.unmap_position(entryPos, transform)
+                if(entryDepth >= depth):
+                    if((entryBound == Bound.EXACT) or (entryBound == Bound.LOWER and entryValue >= beta) or (entryBound == Bound.UPPER and entryValue <= alpha)):
+                        return (entryValue, entryPos)
+                # search the stored best move first
+                openPositions.remove(entryPos)
+                openPositions.insert(0, entryPos)
+            alphaOrig, betaOrig = alpha, beta
 
         if(isMaximizing == True): # maximizing player
             maxPos = openPositions[0]
             maxVal = -999
             for pos in openPositions:
-                tempBoard = deepcopy(board)
-                tempBoard.update(curPNum, pos)
-                curNode = self.minimax(depth-1, False, tempBoard, alpha, beta)
+                board.push(curPNum, pos)
+                curNode = self.minimax(depth-1, False, board, alpha, beta)
+                board.pop()
                 curVal = curNode[0]
                 if(curVal > maxVal):
                     maxVal = curVal
                     maxPos = pos
                 alpha = max(alpha, maxVal)
                 if beta <= alpha:
+                    if(moveOrdering is not None):
+                        moveOrdering.cutoff(board, pos, curPNum, ply, depth)
+                    if(moveStats is not None):
+                        moveStats.cutoffs += 1
                     break
+            if(table is not None):
+                self.store(table, key, depth, maxVal, board.map_position(maxPos, transform), alphaOrig, betaOrig)
+            if(moveHints is not None):
+                moveHints[hintKey] = maxPos
             return (maxVal, maxPos)
         else: # minimizing player
             minPos = openPositions[0]
             minVal = 999
             for pos in openPositions:
-                tempBoard = deepcopy(board)
-                tempBoard.update(curPNum, pos)
-                curNode = self.minimax(depth-1, True, tempBoard, alpha, beta)
+                board.push(curPNum, pos)
+                curNode = self.minimax(depth-1, True, board, alpha, beta)
+                board.pop()
                 curVal = curNode[0]
                 if(curVal < minVal):
                     minVal = curVal
                     minPos = pos
                 beta = min(beta, minVal)
                 if(beta <= alpha):
+                    if(moveOrdering is not None):
+                        moveOrdering.cutoff(board, pos, curPNum, ply, depth)
+                    if(moveStats is not None):
+                        moveStats.cutoffs += 1
                     break
+            if(table is not None):
+                self.store(table, key, depth, minVal, board.map_position(minPos, transform), alphaOrig, betaOrig)
+            if(moveHints is not None):
+                moveHints[hintKey] = minPos
             return (minVal, minPos)
 
+    def store(self, table, key, depth, val, pos, alpha, beta):
+        '''
+        Purpose: Stores a search result in the transposition table along with the kind of bound it represents for the (alpha, beta) window it was searched with.
+        '''
+        if(val <= alpha):
+            bound = Bound.UPPER
+        elif(val >= beta):
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        table.store(key, depth, val, bound, pos)
+
+    def check_budget(self):
+        '''
+        Purpose: Counts a searched node and stops the search (by raising SearchBudgetExceeded) once the time or node budget of the move is used up.
+        '''
+        if(self.nodesLeft is not None):
+            self.nodesLeft -= 1
+            if(self.nodesLeft < 0):
+                raise SearchBudgetExceeded()
+        if(self.deadline is not None and time.perf_counter() > self.deadline):
+            raise SearchBudgetExceeded()
+
+    def iterative_deepening(self, board, maxDepth):
+        '''
+        Purpose: Searches to depth 1, 2, ... until the time or node budget runs out and returns the best move of the deepest completed iteration.
+        Note: The best moves of each iteration are searched first in the next one, which is what makes the repeated shallow searches cheap.
+        '''
+        bestPos = board.open_positions()[0] # fallback if not even the first iteration completes
+        numMoves = len(board.moveStack)
+        if(self.timeLimit is not None):
+            self.deadline = time.perf_counter() + self.timeLimit
+        self.nodesLeft = self.nodeLimit
+        self.moveHints = {}
+        try:
+            for depth in range(1, maxDepth+1):
+                curValue, curPos = self.minimax(depth, True, board, -999, 999)
+                if(curPos is None):
+                    break # the game is a forced draw
+                bestPos = curPos
+                if(abs(curValue) >= 1 or depth >= len(board.open_positions())):
+                    break # the game is decided or the search reached the end of the game
+        except SearchBudgetExceeded:
+            while(len(board.moveStack) > numMoves):
+                board.pop() # undo the moves of the interrupted iteration
+        finally:
+            self.deadline, self.nodesLeft, self.moveHints = None, None, None
+        return bestPos
+
     def get_position(self, board, curRound):
+        if(self.stats is not None):
+            return record_search_stats(self, board, curRound)
+        return self.search(board, curRound)
+
+    def get_positions(self, boards, rounds):
+        return unique_positions(self, boards, rounds)
+
+    def search(self, board, curRound):
         alpha, beta = -999, 999
         depth = board.dim**2 - curRound +1
-        bestValue, bestPos = self.minimax(depth, True, board, alpha, beta)
+        if(self.maxDepth is not None):
+            depth = min(depth, self.maxDepth)
+        if(self.timeLimit is not None or self.nodeLimit is not None):
+            return self.iterative_deepening(board, depth)
+        if(self.workers > 1):
+            bestPos = self.parallel_search(board, depth)
+        else:
+            bestValue, bestPos = self.minimax(depth, True, board, alpha, beta)
+        if(bestPos is None):
+            return board.open_positions()[0] # the game is a forced draw (or there is nothing left to search), so every move is as good
         return bestPos
+
+    def parallel_search(self, board, depth):
+        '''
+        Purpose: Search that splits the root moves across a pool of worker processes and returns the same move as the serial search (without a transposition table).
+        Note: The first root move is searched here before the others are handed out (young brothers wait), so the workers start with a bound.
+            Each worker searches its move with the best value found so far minus a small margin as alpha. A move that fails low is therefore
+            strictly worse than the best move, and ties keep being resolved in favor of the earlier move exactly like in the serial search.
+            Returns None when there is nothing to search (depth 0, a finished game or a forced draw), like the serial minimax() at the root.
+        '''
+        if(not board.check_win() and board.is_forced_draw(self.pNum)):
+            return None # every move ties, and search() picks the same one as the serial search
+        openPositions = board.open_positions()
+        if(self.moveOrdering is not None):
+            openPositions = self.moveOrdering.order(board, openPositions, self.pNum, len(board.moveStack))
+        if(depth == 0 or board.check_win() or len(openPositions) == 0):
+            return None
+
+        board.push(self.pNum, openPositions[0])
+        firstValue = self.minimax(depth-1, False, board, -999, 999)[0]
+        board.pop()
+        if(firstValue >= 1 or len(openPositions) == 1):
+            return openPositions[0] # no other move can be strictly better
+
+        if(self.pool is None):
+            self.sharedAlpha = multiprocessing.Value("d", -999)
+            workerAgent = AlphaBetaMiniMaxAgent(self.pNum, ttSize = self.ttSize, useSymmetry = self.useSymmetry, moveOrdering = self.moveOrdering, collectStats = self.stats is not None)
+            self.pool = ProcessPoolExecutor(max_workers = self.workers, initializer = init_search_worker, initargs = (workerAgent, self.sharedAlpha))
+        self.sharedAlpha.value = firstValue
+        futures = [self.pool.submit(search_root_move, board, pos, depth) for pos in openPositions[1:]]
+        values = [firstValue]
+        for future in futures:
+            curValue, workerStats = future.result()
+            values.append(curValue)
+            if(workerStats is not None and self.moveStats is not None):
+                self.moveStats.merge(workerStats)
+
+        bestValue, bestPos = -999, None
+        for pos, curValue in zip(openPositions, values):
+            if(curValue > bestValue):
+                bestValue, bestPos = curValue, pos
+        return bestPos
+
+    def close(self):
+        '''
+        Purpose: Shuts down the worker processes of the parallel search (they are started again if the agent searches in parallel later).
+        '''
+        if(self.pool is not None):
+            self.pool.shutdown()
+            self.pool, self.sharedAlpha = None, None
+
+_workerAgent = None
+_workerAlpha = None
+
+def init_search_worker(agent, sharedAlpha):
+    '''
+    Purpose: Sets up a worker process of the parallel search with its own copy of the agent (which keeps its transposition table between tasks).
+    '''
+    global _workerAgent, _workerAlpha
+    _workerAgent = agent
+    _workerAlpha = sharedAlpha
+
+def search_root_move(board, pos, depth):
+    '''
+    Purpose: Searches one root move in a worker process and raises the shared bound when it finds a better move.
+    Output:
+        - value: the exact value of the move, or an upper bound that is below the best value if the move fails low
+        - workerStats: SearchStats of the search of the move (None if the agent does not collect stats)
+    '''
+    if(_workerAgent.stats is not None):
+        _workerAgent.moveStats = SearchStats()
+        _workerAgent.moveStats.rootPly = len(board.moveStack)
+    alpha = _workerAlpha.value - 1e-12
+    board.push(_workerAgent.pNum, pos)
+    value = _workerAgent.minimax(depth-1, False, board, alpha, 999)[0]
+    board.pop()
+    if(value > _workerAlpha.value):
+        with _workerAlpha.get_lock():
+            if(value > _workerAlpha.value):
+                _workerAlpha.value = value
+    return value, _workerAgent.moveStats
+
+def record_search_stats(agent, board, curRound):
+    '''
+    Purpose: Runs the search of a search agent for one move while counting its work in agent.moveStats, and adds the counts to agent.stats.
+    '''
+    agent.moveStats = SearchStats()
+    agent.moveStats.rootPly = len(board.moveStack)
+    startTime = time.perf_counter()
+    try:
+        return agent.search(board, curRound)
+    finally:
+        agent.moveStats.numSearches = 1
+        agent.moveStats.elapsed = time.perf_counter() - startTime
+        agent.stats.merge(agent.moveStats)
+
+def unique_positions(agent, boards, rounds):
+    '''
+    Purpose: Batch version of get_position() for deterministic agents, which searches each distinct position of the batch once and gives its move to every board holding it.
+    Note: Agents with useSymmetry also share one search between the rotations and reflections of a position (their transposition table already does).
+        The searches of the batch run one after the other on the same agent, so they share its transposition table and move ordering as well.
+    '''
+    useSymmetry = getattr(agent, "useSymmetry", False)
+    moves = {}
+    positions = []
+    for board, curRound in zip(boards, rounds):
+        if(useSymmetry):
+            key, transform = board.canonical_key()
+        else:
+            key, transform = (board.xBits, board.oBits), None
+        key = (board.dim, key, curRound)
+        if(key not in moves):
+            pos = agent.get_position(board, curRound)
+            moves[key] = pos if transform is None else board.map_position(pos, transform)
+        positions.append(moves[key] if transform is None else board.unmap_position(moves[key], transform))
+    return positions
+
+def vectorized_positions(boards, pNum, policy):
+    '''
+    Purpose: Picks the moves of a batch with the NumPy policies of BatchEngine.py ("random" or "simple").
+    Output:
+        - positions: list of the position played on each board, or None if NumPy is not installed, the boards differ in dimension or the batch is too small to gain from it
+    Note: The NumPy generator is seeded from the random module, so seeding random still makes the moves reproducible.
+    '''
+    if(len(boards) < MIN_VECTORIZED_BATCH or any(board.dim != boards[0].dim for board in boards)):
+        return None
+    try:
+        from BatchEngine import batch_policy_moves
+    except ImportError:
+        return None
+    cellPositions = cell_positions(boards[0].dim)
+    return [cellPositions[idx] for idx in batch_policy_moves(boards, pNum, policy, random.getrandbits(64))]
+
+class SolvedTableAgent(Player):
+
+    '''
+    Purpose: An agent that plays perfectly by looking every move up in a precomputed table of solved positions (see SolvedTable.py).
+    Attributes:
+        - dim: integer value of the board dimension the table is solved for (only 3 is supported)
+        - cachePath: path of the table file (the game is solved and the file is written the first time it is missing)
+    Note: The table is loaded lazily on the first move and memory-mapped, so later runs only pay for a file open.
+    '''
+    def __init__(self, pNum, dim = 3, cachePath = None):
+        if(dim != 3):
+            msg = "The solved table agent only supports boards of dimension 3, since larger boards would take hours to solve."
+            raise Exception(msg)
+        super().__init__(pNum)
+        self.dim = dim
+        self.cachePath = cachePath if cachePath is not None else default_cache_path(dim)
+
+    def __str__(self):
+        return "Solved Table Agent"
+
+    def get_position(self, board, curRound):
+        if(board.dim != self.dim):
+            msg = "The solved table was built for a board of dimension " + str(self.dim) + "."
+            raise Exception(msg)
+        table = load_table(self.cachePath, self.dim)
+        value, bestPos = lookup(table, board, self.pNum)
+        if(bestPos is None):
+            return board.open_positions()[0]
+        return bestPos
+
+    def get_positions(self, boards, rounds):
+        return unique_positions(self, boards, rounds)
+
+class RetrogradeAgent(Player):
+    '''
+    Purpose: An agent that plays perfectly by looking every move up in a packed table built by the retrograde solver (see Retrograde.py).
+    Attributes:
+        - dim: integer value of the board dimension the table is solved for (3 or 4)
+        - tablePath: path of the table file (the board is solved and the file is written the first time it is missing)
+    Note: Unlike the SolvedTableAgent, the table only stores values, so a move costs one lookup per open position.
+    '''
+    def __init__(self, pNum, dim = 4, tablePath = None):
+        super().__init__(pNum)
+        self.dim = dim
+        self.tablePath = tablePath if tablePath is not None else default_table_path(dim)
+
+    def __str__(self):
+        return "Retrograde Agent"
+
+    def get_position(self, board, curRound):
+        if(board.dim != self.dim):
+            msg = "The retrograde table was built for a board of dimension " + str(self.dim) + "."
+            raise Exception(msg)
+        table = load_retrograde_table(self.tablePath, self.dim)
+        value, bestPos = retrograde_best_move(table, board)
+        if(bestPos is None):
+            return board.open_positions()[0]
+        return bestPos
+
+    def get_positions(self, boards, rounds):
+        return unique_positions(self, boards, rounds)
+
+class MCTSNode():
+    '''
+    Purpose: Class for a node of the search tree that is built by the MCTSAgent.
+    Attributes:
+        - pNum: the player that made the move leading to this node
+        - children: dictionary that maps a cell index to the child node reached by playing there
+        - untried: list of cell indices that have not been expanded yet
+        - winner: player number of the winner if the game is over at this node, 0 for a tie and None if the game goes on
+        - visits: number of playouts that passed through this node
+        - wins: playouts won by pNum through this node (ties count as half a win)
+    '''
+    def __init__(self, pNum, board):
+        self.pNum = pNum
+        self.children = {}
+        self.visits = 0
+        self.wins = 0
+        self.winner = None
+        if(board.last_move_won()):
+            self.winner = pNum
+        elif(board.is_auto_tie()):
+            self.winner = 0
+        occupied = board.xBits | board.oBits
+        self.untried = [] if self.winner is not None else [idx for idx in range(board.dim*board.dim) if not (occupied >> idx) & 1]
+
+class MCTSAgent(Player):
+
+    '''
+    Purpose: An agent that uses Monte Carlo tree search (UCT) with random playouts, which scales to boards where exact minimax does not.
+    Attributes:
+        - numPlayouts: integer value that specifies the number of playouts per move (default is 1000)
+        - timeLimit: optional number of seconds per move, which replaces the playout count as the budget
+        - exploration: the UCT exploration constant
+        - root: the search tree of the last move, which is reused for the next move when the game continued from it
+    '''
+    def __init__(self, pNum, numPlayouts = 1000, timeLimit = None, exploration = 1.4):
+        super().__init__(pNum)
+        self.numPlayouts = numPlayouts
+        self.timeLimit = timeLimit
+        self.exploration = exploration
+        self.root = None
+        self.rootBits = None
+        self.rootDim = None
+
+    def __str__(self):
+        return "MCTS Agent"
+
+    def reuse_root(self, board):
+        '''
+        Purpose: Returns the node of the previous search tree that matches the board, or a new root if the game did not continue from that tree.
+        '''
+        node = self.root
+        if(node is not None and self.rootDim == board.dim):
+            rootX, rootO = self.rootBits
+            if((board.xBits & rootX) == rootX and (board.oBits & rootO) == rootO):
+                newX, newO = board.xBits ^ rootX, board.oBits ^ rootO
+                while(node is not None and (newX or newO)):
+                    newBits = newX if node.pNum == 2 else newO # moves of the player to move at this node
+                    if(newBits == 0):
+                        return MCTSNode(self.pNum%2+1, board) # the players did not alternate
+                    bit = newBits & -newBits
+                    if(node.pNum == 2):
+                        newX ^= bit
+                    else:
+                        newO ^= bit
+                    node = node.children.get(bit.bit_length() - 1)
+                if(node is not None and node.pNum != self.pNum and node.winner is None):
+                    return node
+        return MCTSNode(self.pNum%2+1, board)
+
+    def playout(self, root, board):
+        '''
+        Purpose: Runs one selection, expansion, random playout and backpropagation step from the root.
+        '''
+        numMoves = len(board.moveStack)
+        cellPositions = cell_positions(board.dim)
+        node = root
+        path = [node]
+
+        # Selection
+        while(not node.untried and node.children):
+            logVisits = math.log(node.visits)
+            bestScore, bestIdx = -1, None
+            for idx, child in node.children.items():
+                score = child.wins/child.visits + self.exploration*math.sqrt(logVisits/child.visits)
+                if(score > bestScore):
+                    bestScore, bestIdx = score, idx
+            node = node.children[bestIdx]
+            board.push(node.pNum, cellPositions[bestIdx])
+            path.append(node)
+
+        # Expansion
+        if(node.untried):
+            idx = node.untried.pop(random.randrange(len(node.untried)))
+            pNum = node.pNum%2+1
+            board.push(pNum, cellPositions[idx])
+            child = MCTSNode(pNum, board)
+            node.children[idx] = child
+            node = child
+            path.append(node)
+
+        # Random Playout
+        winner = node.winner
+        if(winner is None):
+            occupied = board.xBits | board.oBits
+            emptyCells = [idx for idx in range(board.dim*board.dim) if not (occupied >> idx) & 1]
+            random.shuffle(emptyCells)
+            pNum = node.pNum
+            winner = 0
+            for idx in emptyCells:
+                pNum = pNum%2+1
+                board.push(pNum, cellPositions[idx])
+                if(board.last_move_won()):
+                    winner = pNum
+                    break
+                if(board.is_auto_tie()):
+                    break
+
+        # Backpropagation
+        for pathNode in path:
+            pathNode.visits += 1
+            if(winner == pathNode.pNum):
+                pathNode.wins += 1
+            elif(winner == 0):
+                pathNode.wins += 0.5
+        while(len(board.moveStack) > numMoves):
+            board.pop()
+
+    def get_position(self, board, curRound):
+        root = self.reuse_root(board)
+        if(self.timeLimit is not None):
+            deadline = time.perf_counter() + self.timeLimit
+            while(time.perf_counter() < deadline):
+                self.playout(root, board)
+        else:
+            for playoutNum in range(self.numPlayouts):
+                self.playout(root, board)
+        if(not root.children):
+            # the position is already a forced tie, so the root was never expanded and any open position will do
+            self.root = None
+            return board.open_positions()[0]
+        bestIdx = max(root.children, key = lambda idx: root.children[idx].visits)
+
+        # keep the subtree under the chosen move for the next call
+        self.root = root.children[bestIdx]
+        self.rootDim = board.dim
+        if(self.pNum == 1):
+            self.rootBits = (board.xBits | 1 << bestIdx, board.oBits)
+        else:
+            self.rootBits = (board.xBits, board.oBits | 1 << bestIdx)
+        pos = cell_positions(board.dim)[bestIdx]
+        return pos
+
+    def move_distribution(self, board, curRound):
+        '''
+        Purpose: Overrides the default of the Player class, since the moves of the agent depend on its random playouts and their distribution cannot be computed exactly.
+        '''
+        msg = "The MCTS agent picks its moves with random playouts, so its exact move distribution is unknown (sample games with a Simulation instead)."
+        raise Exception(msg)
@@ -0,0 +1,49 @@
+'''
+Purpose: Registry of the agents by name, used by the scripts that create agents from a name and a board dimension (GameServer.py and Tournament.py).
+'''
+import os
+from Agent import *
+
+AGENTS = {"random": RandomAgent, "simple": SimpleAgent, "minimax": MiniMaxAgent, "alphabeta": AlphaBetaMiniMaxAgent,
+    "solved": SolvedTableAgent, "retrograde": RetrogradeAgent, "mcts": MCTSAgent}
+
+def supports(agentName, dim):
+    '''
+    Purpose: Returns whether an agent can play on a board of the given dimension.
+    Note: The table agents are only solved for small boards, and even the 4 move search of the minimax agent (which does not prune) takes seconds
+        per move on 5x5 and grows by about 5 times with every dimension after that.
+    '''
+    if(agentName == "solved"):
+        return dim == 3
+    if(agentName == "retrograde"):
+        return dim in [3, 4]
+    if(agentName == "minimax"):
+        return dim <= 4
+    return True
+
+def make_agent(agentName, pNum, dim, cacheDir = None):
+    '''
+    Purpose: Creates the agent of the given name for a board of the given dimension.
+    Inputs:
+        - cacheDir: optional directory that the table agents keep their table files in (default is ~/.cache/tictactoe)
+    Note: The minimax agents only search 4 moves ahead on boards larger than 3x3, since a full search would take hours.
+        The alpha beta agent keeps a transposition table, which makes the positions that other games already reached cheap.
+    '''
+    if(agentName not in AGENTS):
+        msg = "Unknown agent " + str(agentName) + ". The options are: " + ", ".join(AGENTS) + "."
+        raise Exception(msg)
+    if(not supports(agentName, dim)):
+        msg = "The " + str(agentName) + " agent cannot play on a board of dimension " + str(dim) + "."
+        raise Exception(msg)
+    if(agentName == "solved"):
+        cachePath = os.path.join(cacheDir, os.path.basename(default_cache_path(dim))) if cacheDir is not None else None
+        return SolvedTableAgent(pNum, dim = dim, cachePath = cachePath)
+    if(agentName == "retrograde"):
+        tablePath = os.path.join(cacheDir, os.path.basename(default_table_path(dim))) if cacheDir is not None else None
+        return RetrogradeAgent(pNum, dim = dim, tablePath = tablePath)
+    maxDepth = 4 if dim > 3 else None
+    if(agentName == "alphabeta"):
+        return AlphaBetaMiniMaxAgent(pNum, ttSize = 10**6, maxDepth = maxDepth) # the table is shared by every game the process plays
+    if(agentName == "minimax"):
+        return MiniMaxAgent(pNum, maxDepth = maxDepth)
+    return AGENTS[agentName](pNum)
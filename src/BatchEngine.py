@@ -0,0 +1,122 @@
+import numpy as np
+from Board import line_masks
+
+_lineMatrixCache = {}
+
+def win_line_matrix(dim):
+    '''
+    Purpose: Returns the (numLines, dim*dim) int8 indicator matrix of the lines of the board, where entry [line, idx] is 1 if cell idx lies on the line.
+    '''
+    if(dim not in _lineMatrixCache):
+        masks = line_masks(dim)
+        matrix = np.zeros((len(masks), dim*dim), dtype = np.int8)
+        for line, mask in enumerate(masks):
+            for idx in range(dim*dim):
+                if((mask >> idx) & 1):
+                    matrix[line, idx] = 1
+        _lineMatrixCache[dim] = matrix
+    return _lineMatrixCache[dim]
+
+def select_batch_moves(rng, cells, token, policy):
+    '''
+    Purpose: Picks one open cell for every board in a (numBoards, dim*dim) cells array for the player with the given token (1 or -1).
+    Note: Every open cell gets a random key in [0, 1), and the simple policy adds 4 to the keys of winning cells and 2 to the keys of the other
+        blocking cells, so taking the largest key picks uniformly among the cells of the highest priority. Every board needs an open cell.
+    '''
+    dim = int(round(cells.shape[1]**0.5))
+    lines = win_line_matrix(dim)
+    keys = rng.random(cells.shape)
+    isEmpty = (cells == 0)
+    if(policy == "simple"):
+        ownCounts = (cells == token).astype(np.int8) @ lines.T
+        otherCounts = (cells == -token).astype(np.int8) @ lines.T
+        winLines = ((ownCounts == dim-1) & (otherCounts == 0)).astype(np.int8)
+        blockLines = ((otherCounts == dim-1) & (ownCounts == 0)).astype(np.int8)
+        keys += np.where((winLines @ lines) > 0, 4, np.where((blockLines @ lines) > 0, 2, 0)) # a winning cell that also blocks is just a winning cell
+    keys[~isEmpty] = -1
+    return keys.argmax(axis = 1)
+
+def boards_to_cells(boards):
+    '''
+    Purpose: Returns the (len(boards), dim*dim) int8 cells array (in the format of BatchEngine.cells) of a list of boards of the same dimension.
+    '''
+    numCells = boards[0].dim**2
+    if(numCells > 62):
+        cells = np.zeros((len(boards), numCells), dtype = np.int8)
+        for i, board in enumerate(boards):
+            for idx in range(numCells):
+                cells[i, idx] = ((board.xBits >> idx) & 1) - ((board.oBits >> idx) & 1)
+        return cells
+    shifts = np.arange(numCells, dtype = np.int64)
+    xBits = np.array([board.xBits for board in boards], dtype = np.int64)
+    oBits = np.array([board.oBits for board in boards], dtype = np.int64)
+    return (((xBits[:, None] >> shifts) & 1) - ((oBits[:, None] >> shifts) & 1)).astype(np.int8)
+
+def batch_policy_moves(boards, pNum, policy, seed = None):
+    '''
+    Purpose: Picks the cell index that player pNum plays on each of a list of boards (of the same dimension, each with an open cell) with one of the batch policies.
+    '''
+    token = 1 if pNum == 1 else -1
+    return select_batch_moves(np.random.default_rng(seed), boards_to_cells(boards), token, policy).tolist()
+
+class BatchEngine():
+    '''
+    Purpose: Class that plays many games at once as NumPy arrays, for baseline statistics of the random and simple policies.
+    Attributes:
+        - numGames: integer value that specifies the number of games played in the batch
+        - dim: integer value that specifies the dimensions of the board (default is 3)
+        - policy1, policy2: the policies of player 1 and player 2
+            - "random" plays a uniformly random open cell (like RandomAgent)
+            - "simple" wins if it can, otherwise blocks an immediate win of the opponent, otherwise plays randomly (like SimpleAgent)
+        - cells: (numGames, dim*dim) int8 array of the boards (1 is a cross, -1 is a nought, 0 is empty)
+        - moves: (numGames, dim*dim) int16 array of the cell played at each ply (-1 after the game ended)
+        - outcomes: (numGames,) int8 array of the game states (1 if player 1 won, -1 if player 2 won, 0 for a tie)
+    '''
+    def __init__(self, numGames, dim = 3, policy1 = "random", policy2 = "random", seed = None):
+        for policy in [policy1, policy2]:
+            if(policy not in ["random", "simple"]):
+                msg = "Unknown batch policy: " + str(policy)
+                raise Exception(msg)
+        self.numGames = numGames
+        self.dim = dim
+        self.policy1 = policy1
+        self.policy2 = policy2
+        self.rng = np.random.default_rng(seed)
+        self.lines = win_line_matrix(dim)
+        self.cells = np.zeros((numGames, dim*dim), dtype = np.int8)
+        self.moves = np.full((numGames, dim*dim), -1, dtype = np.int16)
+        self.outcomes = np.zeros(numGames, dtype = np.int8)
+
+    def select_moves(self, cells, token, policy):
+        '''
+        Purpose: Picks one open cell for every board in cells for the player with the given token (1 or -1) (see select_batch_moves()).
+        '''
+        return select_batch_moves(self.rng, cells, token, policy)
+
+    def run(self):
+        '''
+        Purpose: Plays every game of the batch to the end and returns the outcomes.
+        '''
+        live = np.arange(self.numGames)
+        for ply in range(self.dim*self.dim):
+            if(len(live) == 0):
+                break
+            token, policy = (1, self.policy1) if ply%2 == 0 else (-1, self.policy2)
+            liveCells = self.cells[live]
+            moves = self.select_moves(liveCells, token, policy)
+            liveCells[np.arange(len(live)), moves] = token
+            self.cells[live] = liveCells
+            self.moves[live, ply] = moves
+
+            # a game is won when one of its lines sums to dim times the token that was just played
+            lineSums = liveCells.astype(np.int16) @ self.lines.T
+            won = (lineSums == token*self.dim).any(axis = 1)
+            self.outcomes[live[won]] = token
+            live = live[~won] # retire the finished games
+        return self.outcomes
+
+    def outcome_summary(self):
+        '''
+        Purpose: Returns the [numP1Wins, numP2Wins, numTies] counts of the batch in the format of Simulation.outcome_summary().
+        '''
+        return [int((self.outcomes == 1).sum()), int((self.outcomes == -1).sum()), int((self.outcomes == 0).sum())]
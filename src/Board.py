@@ -1,5 +1,5 @@
+import random
 from enum import Enum
-from copy import deepcopy
 
 class Token(Enum):
     '''
@@ -21,22 +21,167 @@ class Token(Enum):
         strDict = {0: " ", 1: "x", 2: "o"}
         return strDict.get(self.value)
 
+def line_masks(dim):
+    '''
+    Purpose: Returns the bitmasks of every line (rows, columns and both diagonals) on a board of the given dimension.
+    Note: Cell (row, col) is stored at bit row*dim + col. The table is built once per dimension and then shared.
+    '''
+    if(dim not in _lineMaskCache):
+        masks = []
+        for i in range(dim):
+            masks.append(sum(1 << (i*dim + j) for j in range(dim))) # row i
+            masks.append(sum(1 << (j*dim + i) for j in range(dim))) # column i
+        masks.append(sum(1 << (i*dim + i) for i in range(dim))) # major diagonal
+        masks.append(sum(1 << (i*dim + dim-(i+1)) for i in range(dim))) # minor diagonal
+        _lineMaskCache[dim] = masks
+    return _lineMaskCache[dim]
+
+def cell_positions(dim):
+    '''
+    Purpose: Returns the list of position tuples in row-major order, so that cell_positions(dim)[idx] is the position stored at bit idx.
+    '''
+    if(dim not in _cellPositionCache):
+        _cellPositionCache[dim] = [(i,j) for i in range(dim) for j in range(dim)]
+    return _cellPositionCache[dim]
+
+def cell_lines(dim):
+    '''
+    Purpose: Returns, for every cell index, the list of line indices (positions in line_masks(dim)) that pass through that cell.
+    '''
+    if(dim not in _cellLineCache):
+        masks = line_masks(dim)
+        _cellLineCache[dim] = [[line for line, mask in enumerate(masks) if (mask >> idx) & 1] for idx in range(dim*dim)]
+    return _cellLineCache[dim]
+
+def zobrist_keys(dim):
+    '''
+    Purpose: Returns the Zobrist keys of a board of the given dimension as a (crossKeys, noughtKeys, emptyKey) tuple, with one random 64-bit integer per cell
+        in each list and the hash of the empty board (so that positions of different dimensions do not share hashes).
+    Note: The keys are drawn from a generator seeded with the dimension, so hashes are the same across runs and processes.
+    '''
+    if(dim not in _zobristKeyCache):
+        rng = random.Random(dim)
+        crossKeys = [rng.getrandbits(64) for idx in range(dim*dim)]
+        noughtKeys = [rng.getrandbits(64) for idx in range(dim*dim)]
+        _zobristKeyCache[dim] = (crossKeys, noughtKeys, rng.getrandbits(64))
+    return _zobristKeyCache[dim]
+
+def symmetry_permutations(dim):
+    '''
+    Purpose: Returns the cell permutations of the 8 symmetries of a square board (the 4 rotations, each with and without a reflection).
+    Output:
+        - permutations: list of 8 lists, where permutations[t][idx] is the cell index that cell idx is moved to by transform t
+            - transform 0 is the identity
+    '''
+    if(dim not in _symmetryCache):
+        n = dim-1
+        transforms = [lambda r, c: (r, c), lambda r, c: (c, n-r), lambda r, c: (n-r, n-c), lambda r, c: (n-c, r),
+                      lambda r, c: (r, n-c), lambda r, c: (c, r), lambda r, c: (n-r, c), lambda r, c: (n-c, n-r)]
+        permutations = []
+        for transform in transforms:
+            permutation = []
+            for row, col in cell_positions(dim):
+                newRow, newCol = transform(row, col)
+                permutation.append(newRow*dim + newCol)
+            permutations.append(permutation)
+        _symmetryCache[dim] = permutations
+    return _symmetryCache[dim]
+
+def inverse_symmetry_permutations(dim):
+    '''
+    Purpose: Returns the inverses of symmetry_permutations(dim), so that inverse_symmetry_permutations(dim)[t] undoes transform t.
+    '''
+    if(dim not in _inverseSymmetryCache):
+        inverses = []
+        for permutation in symmetry_permutations(dim):
+            inverse = len(permutation)*[0]
+            for idx, newIdx in enumerate(permutation):
+                inverse[newIdx] = idx
+            inverses.append(inverse)
+        _inverseSymmetryCache[dim] = inverses
+    return _inverseSymmetryCache[dim]
+
+def symmetry_byte_tables(dim):
+    '''
+    Purpose: Returns lookup tables that apply each symmetry to a bitboard one byte at a time.
+    Output:
+        - tables: tables[t][k][byte] is the transformed bitboard of the cells 8k to 8k+7 when their bits are equal to byte
+    '''
+    if(dim not in _symmetryByteCache):
+        numBytes = (dim*dim + 7)//8
+        tables = []
+        for permutation in symmetry_permutations(dim):
+            transformTables = []
+            for k in range(numBytes):
+                byteTable = []
+                for byte in range(256):
+                    bits = 0
+                    for b in range(8):
+                        idx = 8*k + b
+                        if((byte >> b) & 1 and idx < dim*dim):
+                            bits |= 1 << permutation[idx]
+                    byteTable.append(bits)
+                transformTables.append(byteTable)
+            tables.append(transformTables)
+        _symmetryByteCache[dim] = tables
+    return _symmetryByteCache[dim]
+
+def line_weights(dim):
+    '''
+    Purpose: Returns the weight of a line holding 0 to dim tokens of a single player, as used by Board.line_score().
+    '''
+    if(dim not in _lineWeightCache):
+        _lineWeightCache[dim] = [0] + [10**(count-1) for count in range(1, dim+1)]
+    return _lineWeightCache[dim]
+
+_lineMaskCache = {}
+_lineWeightCache = {}
+_cellPositionCache = {}
+_cellLineCache = {}
+_zobristKeyCache = {}
+_symmetryCache = {}
+_inverseSymmetryCache = {}
+_symmetryByteCache = {}
+
 class Board():
     '''
     Purpose: Class that creates and manages the TicTacToe game board.
     Attributes:
         - self.dim: an integer value that represents how large the board will be
-        - self.board: 2d list that stores the game tokens
+        - self.xBits: integer bitmask of the cells holding a cross token (bit row*dim + col)
+        - self.oBits: integer bitmask of the cells holding a nought token
+        - self.moveStack: list of (pNum, cell index) pairs for every token played, most recent last
+        - self.xCounts, self.oCounts: number of crosses/noughts on each line (indexed like line_masks(dim))
+        - self.xWins, self.oWins: number of lines completely held by crosses/noughts
+        - self.deadLines: number of lines that hold both tokens and can no longer be won
+        - self.xNeeds, self.oNeeds: histograms where entry k is the number of lines that crosses/noughts can still complete and that need k more tokens
+        - self.zobristHash: Zobrist hash of the position, kept up to date by every move and returned by hash(board)
+        - self.board: 2d list of game tokens built from the bitmasks (read only view)
     '''
     def __init__(self, dim = 3):
         self.dim = dim
-        self.board = [self.dim*[Token.EMPTY] for i in range(self.dim)]
+        self.fullMask = (1 << dim*dim) - 1
+        self.lineMasks = line_masks(dim)
+        self.cellLines = cell_lines(dim)
+        self.zobristKeys = zobrist_keys(dim)
+        self.clear()
+
+    @property
+    def board(self):
+        grid = [self.dim*[Token.EMPTY] for i in range(self.dim)]
+        for idx, pos in enumerate(cell_positions(self.dim)):
+            if((self.xBits >> idx) & 1):
+                grid[pos[0]][pos[1]] = Token.CROSS
+            elif((self.oBits >> idx) & 1):
+                grid[pos[0]][pos[1]] = Token.NOUGHT
+        return grid
 
     def __str__(self):
         boardStr = ""
+        grid = self.board
         hLines = "                   " + (3*self.dim + 1)*"-" + "                  " + "\n"
         for i in range(self.dim):
-            bRow = self.board[i][0:self.dim]
+            bRow = grid[i][0:self.dim]
             row = "                   " + " | ".join(str(tok) for tok in bRow) + "                   " + "\n"
             boardStr += row
             if(i < self.dim - 1):
@@ -45,29 +190,90 @@ class Board():
 
     def __repr__(self):
         boardStr = ""
+        grid = self.board
         hLines = (3*self.dim + 1)*"-"+"\n"
         for i in range(self.dim):
-            row = " | ".join(str(self.board[i][0:self.dim])) + "\n"
+            row = " | ".join(str(grid[i][0:self.dim])) + "\n"
             boardStr += row
             if(i < self.dim - 1):
                 boardStr += hLines
         return boardStr
 
     def __eq__(self, other):
-        positions = [(i,j) for i in range(self.dim) for j in range(self.dim)]
-        for pos in positions:
-            row, col = pos[0], pos[1]
-            if(self.board[row][col] != other.board[row][col]):
-                return Fals
-        return True
+        if(not isinstance(other, Board)):
+            return NotImplemented
+        if(self.zobristHash != other.zobristHash):
+            return False
+        return self.dim == other.dim and self.xBits == other.xBits and self.oBits == other.oBits
+
+    def __hash__(self):
+        '''
+        Purpose: Returns the Zobrist hash of the current position.
+        Note: The hash changes as moves are played, so a board should not be mutated while it is used as a dictionary key.
+        '''
+        return self.zobristHash
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def copy(self):
+        '''
+        Purpose: Returns an independent copy of the board (the shared per-dim tables are not copied).
+        '''
+        newBoard = Board.__new__(Board)
+        newBoard.__dict__.update(self.__dict__)
+        newBoard.moveStack = list(self.moveStack)
+        newBoard.xCounts = list(self.xCounts)
+        newBoard.oCounts = list(self.oCounts)
+        newBoard.xNeeds = list(self.xNeeds)
+        newBoard.oNeeds = list(self.oNeeds)
+        return newBoard
+
+    def transform_bits(self, bits, transform):
+        '''
+        Purpose: Applies one of the 8 board symmetries (see symmetry_permutations()) to a bitboard of this board's dimension.
+        '''
+        transformed = 0
+        for byteTable in symmetry_byte_tables(self.dim)[transform]:
+            transformed |= byteTable[bits & 255]
+            bits >>= 8
+        return transformed
+
+    def canonical_key(self):
+        '''
+        Purpose: Maps the position to a canonical representative that is shared by all of its rotations and reflections.
+        Outputs:
+            - canonicalKey: (xBits, oBits) tuple of the canonical position
+            - transform: the symmetry that takes this board to the canonical position
+                - map_position() and unmap_position() convert positions between the two orientations
+        '''
+        canonicalKey, canonicalTransform = None, 0
+        for transform, transformTables in enumerate(symmetry_byte_tables(self.dim)):
+            xBits, oBits = self.xBits, self.oBits
+            xKey, oKey = 0, 0
+            for byteTable in transformTables:
+                xKey |= byteTable[xBits & 255]
+                oKey |= byteTable[oBits & 255]
+                xBits >>= 8
+                oBits >>= 8
+            if(canonicalKey is None or (xKey, oKey) < canonicalKey):
+                canonicalKey, canonicalTransform = (xKey, oKey), transform
+        return canonicalKey, canonicalTransform
+
+    def map_position(self, pos, transform):
+        '''
+        Purpose: Returns where the position is moved to by the given symmetry (e.g. from this board to its canonical orientation).
+        '''
+        return cell_positions(self.dim)[symmetry_permutations(self.dim)[transform][pos[0]*self.dim + pos[1]]]
+
+    def unmap_position(self, pos, transform):
+        '''
+        Purpose: Undoes map_position(), e.g. takes a position in the canonical orientation back to this board.
+        '''
+        return cell_positions(self.dim)[inverse_symmetry_permutations(self.dim)[transform][pos[0]*self.dim + pos[1]]]
 
     def is_full(self):
-        positions = [(i,j) for i in range(self.dim) for j in range(self.dim)]
-        for pos in positions:
-            row, col = pos[0], pos[1]
-            if(self.board[row][col] == Token.EMPTY):
-                return False
-        return True
+        return (self.xBits | self.oBits) == self.fullMask
 
     def open_positions(self):
         '''
@@ -75,16 +281,10 @@ class Board():
         Output:
             - position: List of position tuples that the player can play in.
         '''
-        positions = []
-
-        if(self.is_full()):
-            return positions
-        else:
-            for i in range(self.dim):
-                for j in range(self.dim):
-                    if(self.board[i][j] == Token.EMPTY):
-                        positions.append((i,j))
-            return positions
+        occupied = self.xBits | self.oBits
+        if(occupied == self.fullMask):
+            return []
+        return [pos for idx, pos in enumerate(cell_positions(self.dim)) if not (occupied >> idx) & 1]
 
     def update(self, pNum: int, pos: tuple[int]):
         '''
@@ -100,23 +300,104 @@ class Board():
             - (dim-1, dim-1) represents the bottom right corner
         '''
 
-        positions = self.open_positions()
-
-        if(pos not in positions):
+        try:
+            row, col = pos[0], pos[1]
+            openCell = len(pos) == 2 and (0 <= row < self.dim) and (0 <= col < self.dim)
+        except (TypeError, IndexError):
+            openCell = False
+        if(openCell):
+            bit = 1 << (row*self.dim + col)
+            openCell = not ((self.xBits | self.oBits) & bit)
+
+        if(not openCell):
             msg = "This position is not open for play."
             raise Exception(msg)
         else:
-            row, col = pos[0], pos[1]
-            if(pNum == 1):
-                self.board[row][col] = Token.CROSS
-            if(pNum == 2):
-                self.board[row][col] = Token.NOUGHT
+            if(pNum == 1 or pNum == 2):
+                self.push(pNum, pos)
+
+    def push(self, pNum, pos):
+        '''
+        Purpose: Plays a token in place and records the move so that it can be undone with pop().
+        Note: Unlike update(), the position is not validated. It is meant for search code that only plays open positions.
+        '''
+        idx = pos[0]*self.dim + pos[1]
+        dim = self.dim
+        if(pNum == 1):
+            self.xBits |= 1 << idx
+            counts, otherCounts = self.xCounts, self.oCounts
+            needs, otherNeeds = self.xNeeds, self.oNeeds
+        else:
+            self.oBits |= 1 << idx
+            counts, otherCounts = self.oCounts, self.xCounts
+            needs, otherNeeds = self.oNeeds, self.xNeeds
+        self.zobristHash ^= self.zobristKeys[pNum-1][idx]
+        for line in self.cellLines[idx]:
+            count = counts[line] + 1
+            counts[line] = count
+            otherCount = otherCounts[line]
+            if(otherCount == 0): # the line is one token closer for the player
+                needs[dim-count+1] -= 1
+                needs[dim-count] += 1
+            if(count == 1): # the line can no longer be completed by the opponent
+                otherNeeds[dim-otherCount] -= 1
+                if(otherCount):
+                    self.deadLines += 1
+            if(count == dim):
+                if(pNum == 1):
+                    self.xWins += 1
+                else:
+                    self.oWins += 1
+        self.moveStack.append((pNum, idx))
+
+    def pop(self):
+        '''
+        Purpose: Undoes the most recent move and returns it as a (pNum, pos) tuple.
+        '''
+        pNum, idx = self.moveStack.pop()
+        dim = self.dim
+        if(pNum == 1):
+            self.xBits ^= 1 << idx
+            counts, otherCounts = self.xCounts, self.oCounts
+            needs, otherNeeds = self.xNeeds, self.oNeeds
+        else:
+            self.oBits ^= 1 << idx
+            counts, otherCounts = self.oCounts, self.xCounts
+            needs, otherNeeds = self.oNeeds, self.xNeeds
+        self.zobristHash ^= self.zobristKeys[pNum-1][idx]
+        for line in self.cellLines[idx]:
+            count = counts[line]
+            if(count == dim):
+                if(pNum == 1):
+                    self.xWins -= 1
+                else:
+                    self.oWins -= 1
+            otherCount = otherCounts[line]
+            if(otherCount == 0):
+                needs[dim-count] -= 1
+                needs[dim-count+1] += 1
+            if(count == 1):
+                otherNeeds[dim-otherCount] += 1
+                if(otherCount):
+                    self.deadLines -= 1
+            counts[line] = count - 1
+        return pNum, cell_positions(self.dim)[idx]
 
     def clear(self):
         '''
         Purpose: Clears the entire board of non-empty tokens
         '''
-        self.board = [self.dim*[Token.EMPTY] for i in range(self.dim) ]
+        self.xBits = 0
+        self.oBits = 0
+        self.moveStack = []
+        self.xCounts = len(self.lineMasks)*[0]
+        self.oCounts = len(self.lineMasks)*[0]
+        self.xWins = 0
+        self.oWins = 0
+        self.deadLines = 0
+        self.xNeeds = self.dim*[0] + [len(self.lineMasks)]
+        self.oNeeds = self.dim*[0] + [len(self.lineMasks)]
+        self.zobristHash = self.zobristKeys[2]
 
     def game_state(self):
         '''
@@ -127,139 +408,116 @@ class Board():
                 -  1 is returned if Player 1 won the game
                 - -1 is returned if Player 2 won the game
         '''
-        # Initial Data for Detecting Diagonal Wins
-        initMajDiagVal = self.board[0][0] # initial major diagonal value at the top right corner (0, 0)
-        majDiagWin = True # flag for detecting a potential win along the major diagonal
-        initMinDiagVal = self.board[0][self.dim-1] # initial minor diagonal value at the top left corner (0, self.dim-1)
-        minDiagWin = True # flag for detecting a potential win along the minor diagonal
+        if(self.xWins):
+            return 1 # Player 1 Wins
+        if(self.oWins):
+            return -1 # Player 2 Wins
+        return 0 # Tie
 
-        # Nested loop that iterates through the board board
-        for i in range(self.dim):
+    def check_win(self):
+        return (self.xWins + self.oWins) > 0
 
-            # Initial Data for Detecting Row and Column Wins
-            initHorVal = self.board[i][0] # initial horizontal value for the given row (i, 0)
-            horWin = True # flag for detecting a potential win along the given row
-            initVertVal = self.board[0][i] # initial horizontal value for the given column (0, i)
-            vertWin = True # flag for detecting a potential win along the given column
-
-            # Data for iterating diagonally
-            curMajDiagVal = self.board[i][i] # The most current value for the major diagonal at the ith iteration that goes from (0, 0) to (self.dim-1, self.dim-1)
-            curMinDiagVal = self.board[i][self.dim-(i+1)] # The most current value for the minor diagonal at the ith iteration that goes from (0, self.dim-1) to (self.dim-1, 0)
-
-            # Diagonal Flag Logic
-            if((majDiagWin == True) and ((curMajDiagVal == Token.EMPTY) or (curMajDiagVal != initMajDiagVal))):
-                majDiagWin = False
-            if((minDiagWin == True) and ((curMinDiagVal == Token.EMPTY) or (curMinDiagVal != initMinDiagVal))):
-                minDiagWin = False
-
-            # Return Statement Logic for Diagonal Wins
-            if((i == (self.dim-1)) and (majDiagWin == True)):
-                if(curMajDiagVal == Token.CROSS):
-                    gameState = 1 # Player 1 Wins
-                    return gameState
-                else:
-                    gameState = -1 # Player 2 Wins
-                    return gameState
-            if((i == (self.dim-1)) and (minDiagWin == True)):
-                if(curMinDiagVal == Token.CROSS):
-                    gameState = 1 # Player 1 Wins
-                    return gameState
-                else:
-                    gameState = -1 # Player 2 Wins
-                    return gameState
-
-            for j in range(self.dim):
-
-                # Data for iterating through the rows and colums
-                curHorVal = self.board[i][j] # The most current value for the given horizontal row i as j varies through the columns
-                curVertVal = self.board[j][i] # The most current value for the given vertical column i as j varies through the rows
-
-                # Flag Logic for Horizontal and Vertical Wins
-                if((horWin == True) and ((curHorVal == Token.EMPTY) or (curHorVal != initHorVal))):
-                    horWin = False
-                if((vertWin == True) and ((curVertVal == Token.EMPTY) or (curVertVal != initVertVal))):
-                    vertWin = False
-
-                # Return statement logic for horizontal and diagonal wins
-                if((j == (self.dim-1)) and (horWin == True)):
-                    if(curHorVal == Token.CROSS):
-                        gameState = 1 # Player 1 Wins
-                        return gameState
-                    else:
-                        gameState = -1 # Player 2 Wins
-                        return gameState
-                if((j == (self.dim-1)) and (vertWin == True)):
-                    if(curVertVal == Token.CROSS):
-                        gameState = 1 # Player 1 Wins
-                        return gameState
-                    else:
-                        gameState = -1 # Player 2 Wins
-                        return gameState
-        gameState = 0 # Tie
-        return gameState
+    def last_move_won(self):
+        '''
+        Purpose: Determines if the most recent move completed a line for the player that made it.
+        '''
+        if(not self.moveStack):
+            return False
+        pNum, idx = self.moveStack[-1]
+        counts = self.xCounts if pNum == 1 else self.oCounts
+        for line in self.cellLines[idx]:
+            if(counts[line] == self.dim):
+                return True
+        return False
+
+    def is_line_dead(self, line):
+        '''
+        Purpose: Determines if the given line (an index into line_masks(dim)) holds both tokens and can no longer be won.
+        '''
+        return self.xCounts[line] > 0 and self.oCounts[line] > 0
 
-    def check_win(self):
-        return (self.game_state() == 1) or (self.game_state() == -1)
+    def threats(self):
+        '''
+        Purpose: Finds every open cell that completes a line for either player in a single pass over the line counts.
+        Output:
+            - (xThreats, oThreats): bitmasks of the open cells where a cross (or a nought) completes a line
+        '''
+        near = self.dim - 1
+        xThreats, oThreats = 0, 0
+        for mask, xCount, oCount in zip(self.lineMasks, self.xCounts, self.oCounts):
+            if(oCount == 0 and xCount == near):
+                xThreats |= mask & ~self.xBits
+            if(xCount == 0 and oCount == near):
+                oThreats |= mask & ~self.oBits
+        return xThreats, oThreats
+
+    def threat_positions(self, pNum):
+        '''
+        Purpose: Returns the (winningPositions, losingPositions) of player pNum from one call to threats().
+        Output:
+            - winningPositions: list of the positions where pNum completes a line
+            - losingPositions: list of the positions where the opponent completes a line
+        '''
+        xThreats, oThreats = self.threats()
+        if(pNum == 2):
+            xThreats, oThreats = oThreats, xThreats
+        positions = cell_positions(self.dim)
+        winningPositions = [positions[idx] for idx in range(self.dim*self.dim) if (xThreats >> idx) & 1] if xThreats else []
+        losingPositions = [positions[idx] for idx in range(self.dim*self.dim) if (oThreats >> idx) & 1] if oThreats else []
+        return winningPositions, losingPositions
 
     def winning_positions(self, pNum):
         '''
         Purpose: Determines the positions the agent can place their token and win.
         '''
-        positions = self.open_positions()
-        winningPositions = []
-        for pos in positions:
-            tempBoard = deepcopy(self)
-            tempBoard.update(pNum, pos)
-            if(pNum == 1 and tempBoard.game_state() == 1):
-                winningPositions.append(pos)
-            if(pNum == 2 and tempBoard.game_state() == -1):
-                winningPositions.append(pos)
-        return winningPositions
+        return self.threat_positions(pNum)[0]
 
     def losing_positions(self, pNum):
         '''
         Purpose: Determines the positions the opponent can place their token and win.
         '''
-        positions = self.open_positions()
-        losingPositions = []
-        for pos in positions:
-            tempBoard = deepcopy(self)
-            tempBoard.update(pNum%2+1, pos)
-            if(pNum == 1 and tempBoard.game_state() == -1):
-                losingPositions.append(pos)
-            if(pNum == 2 and tempBoard.game_state() == 1):
-                losingPositions.append(pos)
-        return losingPositions
+        return self.threat_positions(pNum)[1]
+
+    def line_score(self):
+        '''
+        Purpose: Static evaluation of the position from player 1's point of view, based on the lines that are still winnable.
+        Output:
+            - score: value strictly between -1 and 1
+                - every line that only holds crosses adds 10**(count-1), where count is the number of crosses on it
+                - every line that only holds noughts subtracts 10**(count-1) in the same way
+                - the total is divided by the largest possible total, so a win or a loss (-1 or 1) always outweighs it
+        '''
+        weights = line_weights(self.dim)
+        score = 0
+        for xCount, oCount in zip(self.xCounts, self.oCounts):
+            if(oCount == 0):
+                score += weights[xCount]
+            elif(xCount == 0):
+                score -= weights[oCount]
+        return score/(len(self.lineMasks)*weights[self.dim] + 1)
 
     def is_auto_tie(self):
         '''
         Purpose: Determines if a tie is inevitable before the board is full.
         '''
-        remainingRows = self.dim*[1]
-        remainingColumns = self.dim*[1]
-        remainingDiagonals = 2*[1]
+        return self.deadLines == len(self.lineMasks)
 
-        # Row and Column Checking
-        for i in range(self.dim):
-            curRow = []
-            curCol = []
-            for j in range(self.dim):
-                curRow.append(self.board[i][j])
-                curCol.append(self.board[j][i])
-            if((Token.CROSS in curRow) and (Token.NOUGHT in curRow)):
-                remainingRows[i] = 0
-            if((Token.CROSS in curCol) and (Token.NOUGHT in curCol)):
-                remainingColumns[i] = 0
-
-        # Diagonal Checking
-        majDiag = [self.board[i][i] for i in range(self.dim)]
-        if((Token.CROSS in majDiag) and (Token.NOUGHT in majDiag)):
-            remainingDiagonals[0] = 0
-        minDiag = [self.board[i][self.dim-(i+1)] for i in range(self.dim)]
-        if((Token.CROSS in minDiag) and (Token.NOUGHT in minDiag)):
-            remainingDiagonals[1] = 0
-
-        if((1 in remainingRows) or (1 in remainingColumns) or (1 in remainingDiagonals)):
-            return False
-        else:
-            return True
+    def can_win_within(self, pNum, numMoves):
+        '''
+        Purpose: Determines if player pNum has a line that is still open to them and needs at most numMoves more tokens.
+        '''
+        needs = self.xNeeds if pNum == 1 else self.oNeeds
+        for k in range(min(numMoves, self.dim) + 1):
+            if(needs[k]):
+                return True
+        return False
+
+    def is_forced_draw(self, pNum):
+        '''
+        Purpose: Determines if the game is a tie whatever is played, because neither player can complete a line with the moves they have left.
+        Inputs:
+            - pNum: the player that moves next (it gets the extra move when an odd number of cells is open)
+        Note: This includes is_auto_tie() and the full board, and also catches lines that are open but need more tokens than there are moves left.
+        '''
+        numOpen = self.dim*self.dim - len(self.moveStack)
+        return not self.can_win_within(pNum, (numOpen+1)//2) and not self.can_win_within(pNum%2+1, numOpen//2)
@@ -0,0 +1,233 @@
+'''
+Purpose: Compact append-only file format for the trials of a simulation, with an offset index for reading any trial without loading the others.
+File Format:
+    - record file: a header followed by one record per trial
+        - header: the magic bytes b"TTTR", one byte holding the board dimension, and the two agent names (each as one length byte followed by UTF-8 bytes)
+        - record: one outcome byte (0 for a tie, 1 if player 1 won, 2 if player 2 won) followed by one byte per move holding its cell index (row*dim + col)
+    - index file (the record file path + ".idx"): one little-endian 8 byte offset per trial, pointing to the end of its record
+Note: A record ends where the index says. Every trial also ends at its first win or forced tie (as in GameStateManager.run_headless()), so
+    the records delimit themselves, and opening a file for writing indexes records that were written without an index entry (e.g. when a run
+    was killed or the index file was deleted) by replaying them. Only an unfinished last record is cut off.
+'''
+import os, mmap, struct
+from Board import *
+
+MAGIC = b"TTTR"
+OUTCOME_BYTES = {0: 0, 1: 1, -1: 2}
+OUTCOMES = [0, 1, -1]
+
+def index_path(path):
+    return path + ".idx"
+
+def record_name(name):
+    '''
+    Purpose: Returns the agent name as it is stored in a header (cut to at most 255 UTF-8 bytes).
+    '''
+    return str(name).encode("utf-8")[:255].decode("utf-8", "ignore")
+
+def record_header(dim, agentNames):
+    '''
+    Purpose: Returns the header bytes of a record file.
+    '''
+    header = MAGIC + bytes([dim])
+    for name in agentNames:
+        nameBytes = record_name(name).encode("utf-8")
+        header += bytes([len(nameBytes)]) + nameBytes
+    return header
+
+def record_size(board, data, offset):
+    '''
+    Purpose: Replays the record that starts at the given offset of the data on the (cleared) board and returns its size in bytes, or None if the data ends before the trial does.
+    '''
+    board.clear()
+    if(data[offset] not in OUTCOME_BYTES.values()):
+        msg = "The game record file holds an invalid record at offset " + str(offset) + "."
+        raise Exception(msg)
+    numLines = len(board.lineMasks)
+    positions = cell_positions(board.dim)
+    for size in range(1, len(data) - offset):
+        idx = data[offset + size]
+        if(idx >= len(positions) or ((board.xBits | board.oBits) >> idx) & 1):
+            msg = "The game record file holds an invalid record at offset " + str(offset) + "."
+            raise Exception(msg)
+        board.push(2 - size%2, positions[idx])
+        if(board.xWins or board.oWins or board.deadLines == numLines):
+            if(OUTCOMES[data[offset]] != board.game_state()):
+                msg = "The game record file holds an invalid record at offset " + str(offset) + "."
+                raise Exception(msg)
+            return size + 1
+    return None
+
+def read_header(data):
+    '''
+    Purpose: Parses the header of a record file.
+    Output:
+        - (dim, agentNames, headerSize)
+    '''
+    if(data[0:len(MAGIC)] != MAGIC):
+        msg = "The file is not a game record file."
+        raise Exception(msg)
+    dim = data[len(MAGIC)]
+    offset = len(MAGIC) + 1
+    agentNames = []
+    for player in range(2):
+        nameLength = data[offset]
+        agentNames.append(bytes(data[offset+1:offset+1+nameLength]).decode("utf-8"))
+        offset += 1 + nameLength
+    return dim, agentNames, offset
+
+class GameRecordSink():
+    '''
+    Purpose: Class that appends trials to a game record file, and that can be passed as the sink of Simulation.iter_trials().
+    Attributes:
+        - path: path of the record file (trials are appended to it if it already exists, in which case its dim and agent names have to match)
+        - dim: integer value of the board dimension (at most 15, so that every cell index fits in a byte)
+        - agentNames: list of the names of player 1 and player 2
+    '''
+    def __init__(self, path, dim, agentNames):
+        if(dim > 15):
+            msg = "Game records only support boards of dimension up to 15."
+            raise Exception(msg)
+        self.path = path
+        self.dim = dim
+        self.agentNames = [record_name(name) for name in agentNames]
+        header = record_header(dim, self.agentNames)
+        if(os.path.exists(path) and os.path.getsize(path) > 0):
+            with open(path, "rb") as f:
+                fileDim, fileAgentNames, headerSize = read_header(f.read(len(MAGIC) + 1 + 2*256))
+            if(fileDim != dim or fileAgentNames != self.agentNames):
+                msg = "The game record file holds trials of a different board dimension or agents."
+                raise Exception(msg)
+            self.end = self.recover(headerSize)
+        else:
+            with open(path, "wb") as f:
+                f.write(header)
+            with open(index_path(path), "wb"):
+                pass
+            self.end = len(header)
+        self.file = open(path, "ab")
+        self.indexFile = open(index_path(path), "ab")
+
+    def recover(self, headerSize):
+        '''
+        Purpose: Brings the index back in line with the records and returns the offset where the next record starts.
+        Note: Index entries that point past the records are dropped, and the records after the last index entry (every record, if the index file is missing)
+            are indexed again by replaying them. Only an unfinished last record is cut off.
+        '''
+        dataSize = os.path.getsize(self.path)
+        ends = []
+        if(os.path.exists(index_path(self.path))):
+            with open(index_path(self.path), "rb") as f:
+                indexData = f.read()
+            ends = list(struct.unpack("<" + str(len(indexData)//8) + "Q", indexData[:8*(len(indexData)//8)]))
+            while(ends and ends[-1] > dataSize):
+                ends.pop() # the index was written past the records that made it to disk
+        start = ends[-1] if ends else headerSize
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            data = f.read()
+        board = Board(self.dim)
+        offset = 0
+        while(offset < len(data)):
+            size = record_size(board, data, offset)
+            if(size is None):
+                break
+            offset += size
+            ends.append(start + offset)
+        with open(index_path(self.path), "wb") as f:
+            f.write(struct.pack("<" + str(len(ends)) + "Q", *ends))
+        with open(self.path, "ab") as f:
+            f.truncate(start + offset)
+        return start + offset
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excInfo):
+        self.close()
+
+    def write_moves(self, outcome, cellIndices):
+        '''
+        Purpose: Appends one trial given as its outcome (as returned by Board.game_state()) and the cell indices of its moves.
+        '''
+        record = bytes([OUTCOME_BYTES[outcome]]) + bytes(cellIndices)
+        self.file.write(record)
+        self.end += len(record)
+        self.indexFile.write(struct.pack("<Q", self.end))
+
+    def write(self, trialNum, trialData):
+        trialOutcome, trialGamePositionSummary = trialData
+        self.write_moves(trialOutcome, [row*self.dim + col for row, col in trialGamePositionSummary.values()])
+
+    def flush(self):
+        '''
+        Purpose: Writes the buffered trials to disk (readers ignore index entries that point past the records written so far).
+        '''
+        self.file.flush()
+        self.indexFile.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+        self.indexFile.close()
+
+class GameRecordReader():
+    '''
+    Purpose: Class that memory-maps a game record file and returns any of its trials, as [trialOutcome, trialGamePositionSummary] lists, without reading the others.
+    Attributes:
+        - path: path of the record file
+        - dim: integer value of the board dimension of the trials
+        - agentNames: list of the names of player 1 and player 2
+    Note: reader[i] is the trial at position i of the file (starting at 0), and len(reader) is the number of trials.
+    '''
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+        self.dim, self.agentNames, self.headerSize = read_header(self.data)
+        self.index = None
+        self.numTrials = 0
+        if(os.path.exists(index_path(path)) and os.path.getsize(index_path(path)) >= 8):
+            with open(index_path(path), "rb") as f:
+                self.index = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+            self.numTrials = len(self.index)//8
+            while(self.numTrials > 0 and self.record_end(self.numTrials-1) > len(self.data)):
+                self.numTrials -= 1 # the index was written past the records that made it to disk
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excInfo):
+        self.close()
+
+    def __len__(self):
+        return self.numTrials
+
+    def record_end(self, i):
+        return struct.unpack_from("<Q", self.index, 8*i)[0]
+
+    def moves(self, i):
+        '''
+        Purpose: Returns the (outcome, cellIndices) of the trial at position i, where cellIndices is a bytes object of the cells played in order.
+        '''
+        if(i < 0):
+            i += self.numTrials
+        if(not (0 <= i < self.numTrials)):
+            msg = "There is no trial " + str(i) + " in the game record file."
+            raise IndexError(msg)
+        start = self.record_end(i-1) if i > 0 else self.headerSize
+        record = self.data[start:self.record_end(i)]
+        return OUTCOMES[record[0]], record[1:]
+
+    def __getitem__(self, i):
+        outcome, cellIndices = self.moves(i)
+        return [outcome, {curRound: (idx//self.dim, idx%self.dim) for curRound, idx in enumerate(cellIndices, 1)}]
+
+    def __iter__(self):
+        for i in range(self.numTrials):
+            yield self[i]
+
+    def close(self):
+        if(self.index is not None):
+            self.index.close()
+        self.data.close()
@@ -1,3 +1,4 @@
+from array import array
 from Board import *
 from Agent import *
 
@@ -7,10 +8,10 @@ class GameStateManager():
     Purpose: Class for managing the how the players interact with the environment at each round.
     '''
 
-    def __init__(self, board = Board(), p1 = Player(pNum=1), p2 = Player(pNum=2)):
-        self.board = board
-        self.p1 = p1
-        self.p2 = p2
+    def __init__(self, board = None, p1 = None, p2 = None):
+        self.board = board if board is not None else Board()
+        self.p1 = p1 if p1 is not None else Player(pNum=1)
+        self.p2 = p2 if p2 is not None else Player(pNum=2)
 
 
     def run_game(self):
@@ -62,39 +63,87 @@ class GameStateManager():
 
         '''
         Purpose: Function that runs a given trial for the simulation class.
+        Output:
+            - finalGameState: the outcome of the trial (see Board.game_state())
+            - gamePositionSummary: dictionary that maps every round to the position played in it
         '''
-
-        curRound = 1
-        checkWin = True
-        checkTie = False
-        gamePositionSummary = {}
-        gameBoardSummary = {}
-        openPositions = self.board.open_positions()
-
-        while((checkWin) and (not checkTie)):
-
-            if(curRound%2 == 1 and checkWin and (not checkTie)):
-                pos = self.p1.get_position(self.board, curRound)
-                gamePositionSummary[curRound] = pos
-                self.board.update(1, pos)
-                curCheckWin = self.board.check_win()
-                curCheckTie = self.board.is_auto_tie()
-                if(curCheckWin or (not curCheckTie)):
-                    checkWin = False
-                    checkTie = True
-
-            if(curRound%2 == 0 and checkWin and (not checkTie)):
-                pos = self.p2.get_position(self.board, curRound)
-                gamePositionSummary[curRound] = pos
-                self.board.update(2, pos)
-                curCheckWin = self.board.check_win()
-                curCheckTie = self.board.is_auto_tie()
-                if(curCheckWin or (not curCheckTie)):
-                    checkWin = False
-                    checkTie = True
-
-            curRound += 1
-
-        finalGameState = self.board.game_state()
-
+        moves = move_buffer(self.board.dim)
+        finalGameState, numMoves = self.run_headless(moves)
+        positions = cell_positions(self.board.dim)
+        gamePositionSummary = {curRound: positions[moves[curRound-1]] for curRound in range(1, numMoves+1)}
         return finalGameState, gamePositionSummary
+
+    def run_headless(self, moves):
+        '''
+        Purpose: Lean game loop under run_trial() and the simulations, which plays one game without printing or building anything per move.
+        Inputs:
+            - moves: preallocated array with room for every cell of the board (see move_buffer()), which the cell index of every move is written into
+        Output:
+            - (finalGameState, numMoves): the outcome of the game (see Board.game_state()) and the number of moves written to moves
+        Note: The game ends as soon as a line is completed or every line holds both tokens, which is checked with the line counters the
+            board keeps up to date in push(), so each move costs a single O(1) check on top of the agent's get_position().
+        '''
+        board = self.board
+        dim = board.dim
+        numLines = len(board.lineMasks)
+        players = (self.p1, self.p2)
+        numMoves = 0
+        for curRound in range(1, dim*dim - len(board.moveStack) + 1):
+            pNum = 2 - curRound%2
+            pos = players[pNum-1].get_position(board, curRound)
+            idx = pos[0]*dim + pos[1]
+            if(((board.xBits | board.oBits) >> idx) & 1):
+                msg = "This position is not open for play."
+                raise Exception(msg)
+            board.push(pNum, pos)
+            moves[numMoves] = idx
+            numMoves += 1
+            if(board.xWins or board.oWins or board.deadLines == numLines):
+                break
+        return board.game_state(), numMoves
+
+    def run_lockstep(self, numGames):
+        '''
+        Purpose: Plays numGames games between p1 and p2 side by side (on boards of the dimension of self.board), asking each player for the moves of
+            every game that is still going with a single get_positions() call per round.
+        Output:
+            - trialData: list of [finalGameState, gamePositionSummary] lists, one per game in the format of run_trial()
+        '''
+        dim = self.board.dim
+        numCells = dim*dim
+        numLines = len(self.board.lineMasks)
+        players = (self.p1, self.p2)
+        boards = [Board(dim) for game in range(numGames)]
+        moves = move_buffer(dim, numGames) # the moves of game i start at i*numCells
+        numMoves = numGames*[0]
+        live = list(range(numGames))
+        for curRound in range(1, numCells+1):
+            if(len(live) == 0):
+                break
+            pNum = 2 - curRound%2
+            liveBoards = [boards[game] for game in live]
+            positions = players[pNum-1].get_positions(liveBoards, len(live)*[curRound])
+            stillLive = []
+            for game, board, pos in zip(live, liveBoards, positions):
+                idx = pos[0]*dim + pos[1]
+                if(((board.xBits | board.oBits) >> idx) & 1):
+                    msg = "This position is not open for play."
+                    raise Exception(msg)
+                board.push(pNum, pos)
+                moves[game*numCells + curRound-1] = idx
+                numMoves[game] = curRound
+                if(not (board.xWins or board.oWins or board.deadLines == numLines)):
+                    stillLive.append(game)
+            live = stillLive
+        cellPositions = cell_positions(dim)
+        trialData = []
+        for game, board in enumerate(boards):
+            gamePositionSummary = {curRound: cellPositions[moves[game*numCells + curRound-1]] for curRound in range(1, numMoves[game]+1)}
+            trialData.append([board.game_state(), gamePositionSummary])
+        return trialData
+
+def move_buffer(dim, numGames = 1):
+    '''
+    Purpose: Returns a zeroed array that can hold the cell index of every move of numGames games on a board of the given dimension (see run_headless()).
+    '''
+    return array("H", bytes(2*dim*dim*numGames))
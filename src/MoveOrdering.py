@@ -0,0 +1,118 @@
+from Board import *
+
+class MoveOrdering():
+    '''
+    Purpose: Base class for the move ordering strategies that AlphaBetaMiniMaxAgent can use to search the most promising moves first.
+    Note: Every strategy sorts stably, so the moves it has no preference between keep their order.
+    '''
+    def order(self, board, positions, pNum, ply):
+        '''
+        Purpose: Returns the positions in the order they should be searched for player pNum at the given ply (number of tokens on the board).
+        '''
+        return positions
+
+    def cutoff(self, board, pos, pNum, ply, depth):
+        '''
+        Purpose: Called when searching pos caused a beta cutoff with depth plies left to search.
+        '''
+        pass
+
+class StaticOrdering(MoveOrdering):
+    '''
+    Purpose: Searches the cells that lie on the most lines first (the center and corners on a 3x3 board).
+    '''
+    def order(self, board, positions, pNum, ply):
+        cellLines = board.cellLines
+        dim = board.dim
+        return sorted(positions, key = lambda pos: -len(cellLines[pos[0]*dim + pos[1]]))
+
+class ThreatOrdering(MoveOrdering):
+    '''
+    Purpose: Searches the moves that win immediately first, followed by the moves that block an immediate win of the opponent.
+    '''
+    def order(self, board, positions, pNum, ply):
+        winningBits, losingBits = board.threats()
+        if(pNum == 2):
+            winningBits, losingBits = losingBits, winningBits
+        if(winningBits == 0 and losingBits == 0):
+            return positions
+        dim = board.dim
+        return sorted(positions, key = lambda pos: 0 if (winningBits >> (pos[0]*dim + pos[1])) & 1 else (1 if (losingBits >> (pos[0]*dim + pos[1])) & 1 else 2))
+
+class KillerMoves(MoveOrdering):
+    '''
+    Purpose: Searches the last moves that caused a cutoff at the same ply first.
+    Attributes:
+        - numSlots: integer value that specifies how many killer moves are kept per ply
+        - killers: dictionary that maps a ply to its killer moves, most recent first
+    '''
+    def __init__(self, numSlots = 2):
+        self.numSlots = numSlots
+        self.killers = {}
+
+    def order(self, board, positions, pNum, ply):
+        killers = self.killers.get(ply)
+        if(not killers):
+            return positions
+        return sorted(positions, key = lambda pos: killers.index(pos) if pos in killers else self.numSlots)
+
+    def cutoff(self, board, pos, pNum, ply, depth):
+        killers = self.killers.setdefault(ply, [])
+        if(pos in killers):
+            killers.remove(pos)
+        killers.insert(0, pos)
+        del killers[self.numSlots:]
+
+class HistoryHeuristic(MoveOrdering):
+    '''
+    Purpose: Searches the moves that caused the most (and deepest) cutoffs so far first.
+    Attributes:
+        - history: dictionary that maps a (pNum, pos) pair to the sum of depth**2 over its cutoffs
+    '''
+    def __init__(self):
+        self.history = {}
+
+    def order(self, board, positions, pNum, ply):
+        history = self.history
+        return sorted(positions, key = lambda pos: -history.get((pNum, pos), 0))
+
+    def cutoff(self, board, pos, pNum, ply, depth):
+        self.history[(pNum, pos)] = self.history.get((pNum, pos), 0) + depth*depth
+
+class CombinedOrdering(MoveOrdering):
+    '''
+    Purpose: Combines several strategies, where the earlier strategies in the list take precedence over the later ones.
+    Attributes:
+        - orderings: list of MoveOrdering objects, highest priority first
+    '''
+    def __init__(self, orderings):
+        self.orderings = orderings
+
+    def order(self, board, positions, pNum, ply):
+        for ordering in reversed(self.orderings): # stable sorts, so the last one applied has the final say
+            positions = ordering.order(board, positions, pNum, ply)
+        return positions
+
+    def cutoff(self, board, pos, pNum, ply, depth):
+        for ordering in self.orderings:
+            ordering.cutoff(board, pos, pNum, ply, depth)
+
+def default_move_ordering():
+    '''
+    Purpose: Returns the recommended combination: immediate wins and blocks, then killer moves, then the history table, then center and corners.
+    '''
+    return CombinedOrdering([ThreatOrdering(), KillerMoves(), HistoryHeuristic(), StaticOrdering()])
+
+def ordering_node_counts(board, pNum, depth, moveOrdering):
+    '''
+    Purpose: Measures the pruning gain of a move ordering by searching the same position with and without it.
+    Output:
+        - (unorderedNodes, orderedNodes): number of nodes visited by the unordered and the ordered alpha beta search
+    '''
+    from Agent import AlphaBetaMiniMaxAgent
+    unorderedAgent = AlphaBetaMiniMaxAgent(pNum)
+    orderedAgent = AlphaBetaMiniMaxAgent(pNum, moveOrdering = moveOrdering)
+    unorderedValue = unorderedAgent.minimax(depth, True, board, -999, 999)[0]
+    orderedValue = orderedAgent.minimax(depth, True, board, -999, 999)[0]
+    assert unorderedValue == orderedValue # ordering can only change the amount of work, not the result
+    return unorderedAgent.nodesVisited, orderedAgent.nodesVisited
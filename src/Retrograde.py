@@ -0,0 +1,140 @@
+'''
+Purpose: Retrograde (backward induction) solver that stores the value of every position of a board in a packed 2-bit table.
+File Format:
+    - a 5 byte header: the magic bytes b"TTTV" followed by one byte holding the board dimension
+    - 2 bits per position, where position_index(board) = i is stored in byte i//4 at bit 2*(i%4) after the header
+        - 0: the position is unreachable (the token counts do not fit player 1 moving first and the players alternating)
+        - 1, 2, 3: the player to move loses, ties or wins with perfect play
+Note: Building the table needs NumPy, but looking positions up in an existing table does not.
+'''
+import os, mmap, tempfile
+from itertools import combinations
+from Board import *
+from SolvedTable import position_index
+
+MAGIC = b"TTTV"
+LOSS, TIE, WIN = 1, 2, 3
+
+_tableCache = {}
+
+def default_table_path(dim = 4):
+    '''
+    Purpose: Returns the default location of the retrograde table file for the given board dimension.
+    '''
+    return os.path.join(os.path.expanduser("~"), ".cache", "tictactoe", "retrograde_" + str(dim) + "x" + str(dim) + ".bin")
+
+def solve_retrograde(dim = 4):
+    '''
+    Purpose: Solves every reachable position of the board, one layer (number of tokens) at a time from the full boards back to the empty board.
+    Output:
+        - values: NumPy uint8 array with one LOSS/TIE/WIN value per position index (0 for unreachable positions)
+    Note: The positions of a layer are enumerated as the choice of the occupied cells times the choice of which of them hold crosses,
+        and each layer only looks up the values of the layer after it, which are already final.
+    '''
+    import numpy as np
+    if(dim > 4):
+        msg = "The retrograde table of a board of dimension " + str(dim) + " does not fit in memory."
+        raise Exception(msg)
+    numCells = dim*dim
+    powers3 = 3**np.arange(numCells, dtype = np.int64)
+    powers2 = 2**np.arange(numCells, dtype = np.int64)
+    masks = np.array(line_masks(dim), dtype = np.int64)
+    values = np.zeros(3**numCells, dtype = np.uint8)
+
+    for numTokens in range(numCells, -1, -1):
+        numCrosses = (numTokens+1)//2
+        crossToMove = (numTokens%2 == 0)
+        occupiedCells = list(combinations(range(numCells), numTokens))
+        occupiedCells = np.array(occupiedCells, dtype = np.int64).reshape(len(occupiedCells), numTokens)
+        crossPatterns = [[j in crosses for j in range(numTokens)] for crosses in combinations(range(numTokens), numCrosses)]
+        crossPatterns = np.array(crossPatterns, dtype = np.int64).reshape(len(crossPatterns), numTokens)
+
+        # rank, cross bitboard and nought bitboard of every (occupied cells, crosses) pair
+        ranks = (powers3[occupiedCells] @ (2 - crossPatterns).T).ravel()
+        xBits = (powers2[occupiedCells] @ crossPatterns.T).ravel()
+        oBits = (powers2[occupiedCells] @ (1 - crossPatterns).T).ravel()
+
+        xWon = ((xBits[:, None] & masks) == masks).any(axis = 1)
+        oWon = ((oBits[:, None] & masks) == masks).any(axis = 1)
+        moverWon, lastMoverWon = (xWon, oWon) if crossToMove else (oWon, xWon)
+        layerValues = np.where(lastMoverWon, LOSS, np.where(moverWon, WIN, 0)).astype(np.uint8)
+
+        if(numTokens == numCells):
+            layerValues[layerValues == 0] = TIE
+        else:
+            token = 1 if crossToMove else 2
+            openBits = ~(xBits | oBits)
+            bestValues = np.zeros(len(ranks), dtype = np.uint8)
+            undecided = (layerValues == 0)
+            for idx in range(numCells):
+                selected = undecided & (((openBits >> idx) & 1) == 1)
+                childValues = values[ranks[selected] + token*powers3[idx]] # values for the opponent, who moves next
+                bestValues[selected] = np.maximum(bestValues[selected], 4 - childValues)
+            layerValues = np.where(undecided, bestValues, layerValues)
+        values[ranks] = layerValues
+    return values
+
+def write_retrograde_table(path, dim = 4):
+    '''
+    Purpose: Solves the board and writes the packed table to the given file, creating its directory if needed.
+    '''
+    import numpy as np
+    values = solve_retrograde(dim)
+    padded = np.zeros(-(-len(values)//4)*4, dtype = np.uint8)
+    padded[:len(values)] = values
+    packed = padded[0::4] | (padded[1::4] << 2) | (padded[2::4] << 4) | (padded[3::4] << 6)
+    directory = os.path.dirname(path)
+    if(directory):
+        os.makedirs(directory, exist_ok = True)
+    # every writer gets its own temporary file, so processes that solve the board at the same time do not clash
+    tempFd, tempPath = tempfile.mkstemp(dir = directory or ".", suffix = ".tmp")
+    with os.fdopen(tempFd, "wb") as f:
+        f.write(MAGIC + bytes([dim]))
+        f.write(packed.tobytes())
+    os.replace(tempPath, path) # so that a concurrent reader never sees a partial file
+
+def load_retrograde_table(path, dim = 4):
+    '''
+    Purpose: Memory-maps the table stored at the given path, solving the board and writing the file first if it is missing or invalid.
+    Note: Each file is only mapped once per process and then shared by every caller.
+    '''
+    if((path, dim) in _tableCache):
+        return _tableCache[(path, dim)]
+    expectedSize = len(MAGIC) + 1 + -(-3**(dim*dim)//4)
+    if(not (os.path.exists(path) and os.path.getsize(path) == expectedSize)):
+        write_retrograde_table(path, dim)
+    with open(path, "rb") as f:
+        table = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+    if(table[0:len(MAGIC)+1] != MAGIC + bytes([dim])):
+        table.close()
+        write_retrograde_table(path, dim)
+        with open(path, "rb") as f:
+            table = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+    _tableCache[(path, dim)] = table
+    return table
+
+def retrograde_value(table, index):
+    '''
+    Purpose: Returns the 2-bit value stored for a position index (0 if unreachable, otherwise LOSS, TIE or WIN for the player to move).
+    '''
+    return (table[len(MAGIC) + 1 + index//4] >> (2*(index%4))) & 3
+
+def retrograde_best_move(table, board):
+    '''
+    Purpose: Returns the (value, bestPos) of the position for the player to move, where value is 1, 0 or -1 and bestPos is the first open position that achieves it.
+    Note: The player to move is player 1 if both players have played the same number of tokens, and player 2 otherwise.
+    '''
+    numCrosses, numNoughts = bin(board.xBits).count("1"), bin(board.oBits).count("1")
+    if(numCrosses - numNoughts not in [0, 1]):
+        msg = "The position can not be reached with player 1 moving first."
+        raise Exception(msg)
+    token = 1 if numCrosses == numNoughts else 2
+    index = position_index(board)
+    occupied = board.xBits | board.oBits
+    bestValue, bestPos = 0, None
+    for idx, pos in enumerate(cell_positions(board.dim)):
+        if(not (occupied >> idx) & 1):
+            curValue = 4 - retrograde_value(table, index + token*3**idx)
+            if(curValue > bestValue):
+                bestValue, bestPos = curValue, pos
+    return bestValue - 2, bestPos
@@ -0,0 +1,60 @@
+class SearchStats():
+    '''
+    Purpose: Class that counts the work done by the search agents, either for a single move or summed over many.
+    Attributes:
+        - numSearches: number of get_position() calls that are counted
+        - nodes: number of positions searched
+        - leafEvaluations: number of positions scored with the agent's value() function
+        - cutoffs: number of times alpha beta pruning skipped the remaining moves of a position
+        - maxDepth: number of moves past the root of the deepest position searched
+        - cacheLookups: number of transposition table lookups
+        - cacheHits: number of transposition table lookups that found an entry
+        - elapsed: seconds spent in get_position()
+    Note: Agents only count when they are created with collectStats = True, so the searches of other agents pay a single None check per node.
+    '''
+    def __init__(self):
+        self.numSearches = 0
+        self.nodes = 0
+        self.leafEvaluations = 0
+        self.cutoffs = 0
+        self.maxDepth = 0
+        self.cacheLookups = 0
+        self.cacheHits = 0
+        self.elapsed = 0.0
+        self.rootPly = 0 # number of moves on the board when the current search started
+
+    def __str__(self):
+        return ("Searches: " + str(self.numSearches) + ", Nodes: " + str(self.nodes) + ", Leaf Evaluations: " + str(self.leafEvaluations)
+            + ", Cutoffs: " + str(self.cutoffs) + ", Max Depth: " + str(self.maxDepth) + ", Cache Hit Rate: " + str(round(self.hit_rate(), 3))
+            + ", Elapsed: " + str(round(self.elapsed, 3)) + "s")
+
+    def hit_rate(self):
+        if(self.cacheLookups == 0):
+            return 0.0
+        return self.cacheHits/self.cacheLookups
+
+    def time_per_search(self):
+        if(self.numSearches == 0):
+            return 0.0
+        return self.elapsed/self.numSearches
+
+    def merge(self, other):
+        '''
+        Purpose: Adds the counts of another SearchStats object to this one (the max depth is the deeper of the two).
+        '''
+        self.numSearches += other.numSearches
+        self.nodes += other.nodes
+        self.leafEvaluations += other.leafEvaluations
+        self.cutoffs += other.cutoffs
+        self.maxDepth = max(self.maxDepth, other.maxDepth)
+        self.cacheLookups += other.cacheLookups
+        self.cacheHits += other.cacheHits
+        self.elapsed += other.elapsed
+        return self
+
+    def summary(self):
+        '''
+        Purpose: Returns the counts as a dictionary (e.g. to be written out with json).
+        '''
+        return {"searches": self.numSearches, "nodes": self.nodes, "leafEvaluations": self.leafEvaluations, "cutoffs": self.cutoffs,
+            "maxDepth": self.maxDepth, "hitRate": self.hit_rate(), "elapsed": self.elapsed}
@@ -0,0 +1,124 @@
+'''
+Purpose: Tools for solving small boards once and storing perfect play in a compact binary table.
+File Format:
+    - a 5 byte header: the magic bytes b"TTTS" followed by one byte holding the board dimension
+    - one byte per (position, player to move) pair, at offset 2*position_index(board) + (pNum-1) after the header
+        - the top 2 bits hold the value for the player to move (0 is a loss, 1 is a tie, 2 is a win)
+        - the low 6 bits hold the cell index of the best move (63 if the game is already over)
+'''
+import os, mmap, tempfile
+from Board import *
+
+MAGIC = b"TTTS"
+NO_MOVE = 63
+
+_tableCache = {}
+
+def default_cache_path(dim = 3):
+    '''
+    Purpose: Returns the default location of the table file for the given board dimension.
+    '''
+    return os.path.join(os.path.expanduser("~"), ".cache", "tictactoe", "solved_" + str(dim) + "x" + str(dim) + ".bin")
+
+def position_index(board):
+    '''
+    Purpose: Returns the base-3 rank of the position, where cell idx contributes 3**idx times 0 (empty), 1 (cross) or 2 (nought).
+    '''
+    index, power = 0, 1
+    xBits, oBits = board.xBits, board.oBits
+    for idx in range(board.dim*board.dim):
+        if((xBits >> idx) & 1):
+            index += power
+        elif((oBits >> idx) & 1):
+            index += 2*power
+        power *= 3
+    return index
+
+def solve_table(dim = 3):
+    '''
+    Purpose: Solves every position of the board (for either player to move) and returns the table described above as a bytearray.
+    Note: The table has 2*3**(dim*dim) entries, so this is only practical for dim = 3.
+    '''
+    numCells = dim*dim
+    powers = [3**idx for idx in range(numCells)]
+    table = bytearray(b"\xff")*(2*3**numCells)
+    board = Board(dim)
+
+    def solve(index, pNum):
+        entry = table[2*index + pNum-1]
+        if(entry != 0xff):
+            return (entry >> 6) - 1
+        state = board.game_state()
+        if(state != 0 or board.is_full()):
+            value = state if pNum == 1 else -state
+            table[2*index + pNum-1] = ((value+1) << 6) | NO_MOVE
+            return value
+        bestValue, bestIdx = -2, NO_MOVE
+        occupied = board.xBits | board.oBits
+        for idx in range(numCells):
+            if(not (occupied >> idx) & 1):
+                board.push(pNum, (idx//dim, idx%dim))
+                value = -solve(index + pNum*powers[idx], pNum%2+1)
+                board.pop()
+                if(value > bestValue):
+                    bestValue, bestIdx = value, idx
+        table[2*index + pNum-1] = ((bestValue+1) << 6) | bestIdx
+        return bestValue
+
+    for index in range(3**numCells):
+        # decode the rank into the board and solve it for both players
+        board.clear()
+        rest = index
+        for idx in range(numCells):
+            rest, cellVal = divmod(rest, 3)
+            if(cellVal != 0):
+                board.push(cellVal, (idx//dim, idx%dim))
+        solve(index, 1)
+        solve(index, 2)
+    return table
+
+def write_table(path, dim = 3):
+    '''
+    Purpose: Solves the board and writes the table to the given file, creating its directory if needed.
+    '''
+    table = solve_table(dim)
+    directory = os.path.dirname(path)
+    if(directory):
+        os.makedirs(directory, exist_ok = True)
+    # every writer gets its own temporary file, so processes that solve the board at the same time do not clash
+    tempFd, tempPath = tempfile.mkstemp(dir = directory or ".", suffix = ".tmp")
+    with os.fdopen(tempFd, "wb") as f:
+        f.write(MAGIC + bytes([dim]))
+        f.write(table)
+    os.replace(tempPath, path) # so that a concurrent reader never sees a partial file
+
+def load_table(path, dim = 3):
+    '''
+    Purpose: Memory-maps the table stored at the given path, solving the board and writing the file first if it is missing or invalid.
+    Output:
+        - table: read-only memory map of the whole file (entries start after the 5 byte header)
+    Note: Each file is only mapped once per process and then shared by every caller.
+    '''
+    if((path, dim) in _tableCache):
+        return _tableCache[(path, dim)]
+    expectedSize = len(MAGIC) + 1 + 2*3**(dim*dim)
+    if(not (os.path.exists(path) and os.path.getsize(path) == expectedSize)):
+        write_table(path, dim)
+    with open(path, "rb") as f:
+        table = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+    if(table[0:len(MAGIC)+1] != MAGIC + bytes([dim])):
+        table.close()
+        write_table(path, dim)
+        with open(path, "rb") as f:
+            table = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+    _tableCache[(path, dim)] = table
+    return table
+
+def lookup(table, board, pNum):
+    '''
+    Purpose: Returns the (value, bestPos) stored for the position with pNum to move, where value is 1, 0 or -1 for the player to move.
+    '''
+    entry = table[len(MAGIC) + 1 + 2*position_index(board) + pNum-1]
+    moveIdx = entry & 63
+    bestPos = None if moveIdx == NO_MOVE else (moveIdx//board.dim, moveIdx%board.dim)
+    return (entry >> 6) - 1, bestPos
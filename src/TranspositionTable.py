@@ -0,0 +1,75 @@
+from enum import Enum
+from collections import OrderedDict
+
+class Bound(Enum):
+    '''
+    Purpose: Class that defines enumerations for the kind of value stored in a transposition table entry.
+    '''
+
+    EXACT = 0 # the stored value is the exact minimax value of the position
+    LOWER = 1 # the search failed high, so the true value is at least the stored value
+    UPPER = 2 # the search failed low, so the true value is at most the stored value
+
+class TranspositionTable():
+    '''
+    Purpose: Class that caches search results by position so that positions reached through different move orders are only searched once.
+    Attributes:
+        - self.maxEntries: integer value that caps the number of stored positions (the least recently used entry is evicted first)
+        - self.table: ordered dictionary that maps a position key to a (depth, value, bound, bestPos) tuple
+        - self.hits: number of lookups that found an entry
+        - self.misses: number of lookups that did not find an entry
+    '''
+    def __init__(self, maxEntries = 100000):
+        self.maxEntries = maxEntries
+        self.table = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.table)
+
+    def __str__(self):
+        return "Transposition Table (" + str(len(self.table)) + "/" + str(self.maxEntries) + " entries, " + str(self.hits) + " hits, " + str(self.misses) + " misses)"
+
+    def lookup(self, key):
+        '''
+        Purpose: Returns the (depth, value, bound, bestPos) entry stored for the key, or None if the position has not been stored.
+        '''
+        entry = self.table.get(key)
+        if(entry is None):
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.table.move_to_end(key)
+        return entry
+
+    def store(self, key, depth, value, bound, bestPos):
+        '''
+        Purpose: Stores a search result for the key.
+        Note: An existing entry searched to a greater depth is kept, so shallow searches do not overwrite deeper results.
+        '''
+        entry = self.table.get(key)
+        if(entry is not None):
+            self.table.move_to_end(key)
+            if(entry[0] > depth):
+                return
+        elif(len(self.table) >= self.maxEntries):
+            self.table.popitem(last = False)
+        self.table[key] = (depth, value, bound, bestPos)
+
+    def hit_rate(self):
+        '''
+        Purpose: Returns the fraction of lookups that found an entry (0 if there were no lookups).
+        '''
+        numLookups = self.hits + self.misses
+        if(numLookups == 0):
+            return 0
+        return self.hits/numLookups
+
+    def clear(self):
+        '''
+        Purpose: Removes every entry and resets the hit and miss counts.
+        '''
+        self.table.clear()
+        self.hits = 0
+        self.misses = 0
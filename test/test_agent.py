@@ -1,6 +1,8 @@
 import pytest, sys, os, random
 sys.path.append(os.path.abspath(os.path.join("..", "src")))
 from Agent import *
+from GameStateManager import GameStateManager
+from copy import deepcopy
 from contextlib import contextmanager
 from io import StringIO
 
@@ -60,3 +62,364 @@ def test_player_get_position():
         pos = consoleAgent.get_position()
         assert pos == (3,9)
 '''
+
+def test_alpha_beta_transposition_table():
+    '''
+    Purpose: Tests the transposition table option of the AlphaBetaMiniMaxAgent.
+    Test Cases:
+        1. The agent finds the same forced moves with and without the table
+        2. The table is reused across moves and games (expected to record hits)
+        3. The agent never loses to a random agent
+        4. Entries stored for one board dimension are not used on another one
+    '''
+    agent1 = AlphaBetaMiniMaxAgent(pNum = 1, ttSize = 10000)
+    agent2 = AlphaBetaMiniMaxAgent(pNum = 2, ttSize = 10000)
+
+    # ---------- Test Case 1 ----------
+    b1 = Board()
+    b1.update(1, (0,0))
+    b1.update(2, (1,1))
+    b1.update(1, (0,1))
+    b1.update(2, (2,0))
+    assert agent1.get_position(b1, 5) == (0,2)
+    assert agent2.get_position(b1, 5) == (0,2)
+
+    # ---------- Test Case 2 & 3 ----------
+    for trial in range(5):
+        board = Board()
+        opponent = RandomAgent(pNum = 2)
+        curRound = 1
+        while(not board.check_win() and not board.is_full()):
+            if(curRound%2 == 1):
+                board.update(1, agent1.get_position(board, curRound))
+            else:
+                board.update(2, opponent.get_position(board, curRound))
+            curRound += 1
+        assert board.game_state() != -1 # Test Case 3
+    assert agent1.transpositionTable.hits > 0 # Test Case 2
+    assert len(agent1.transpositionTable) <= 10000
+
+    # ---------- Test Case 4 ----------
+    for useSymmetry in [False, True]:
+        agent = AlphaBetaMiniMaxAgent(pNum = 1, ttSize = 10**5, useSymmetry = useSymmetry)
+        agent.minimax(9, True, Board(), -999, 999)
+        expected = AlphaBetaMiniMaxAgent(pNum = 1, ttSize = 10**5, useSymmetry = useSymmetry).minimax(3, True, Board(4), -999, 999)
+        assert agent.minimax(3, True, Board(4), -999, 999) == expected and expected[0] != 0
+
+def test_alpha_beta_symmetry():
+    '''
+    Purpose: Tests the useSymmetry option of the AlphaBetaMiniMaxAgent.
+    Test Cases:
+        1. The agent blocks the same forced move in every orientation of the board
+        2. Symmetric positions share entries (expected to store fewer positions than without symmetry)
+    '''
+    plainAgent = AlphaBetaMiniMaxAgent(pNum = 1, ttSize = 10000)
+    symmetryAgent = AlphaBetaMiniMaxAgent(pNum = 1, ttSize = 10000, useSymmetry = True)
+    moves = [(1,(0,0)), (2,(1,1)), (1,(0,1)), (2,(2,0))]
+    for permutation in symmetry_permutations(3):
+        b = Board()
+        for pNum, pos in moves:
+            idx = permutation[pos[0]*3 + pos[1]]
+            b.update(pNum, (idx//3, idx%3))
+        idx = permutation[2]
+        assert symmetryAgent.get_position(b, 5) == (idx//3, idx%3) # Test Case 1
+
+    plainAgent.get_position(Board(), 1)
+    symmetryAgent.transpositionTable.clear()
+    symmetryAgent.get_position(Board(), 1)
+    assert len(symmetryAgent.transpositionTable) < len(plainAgent.transpositionTable) # Test Case 2
+
+def test_alpha_beta_iterative_deepening():
+    '''
+    Purpose: Tests the time and node budgets (iterative deepening) of the AlphaBetaMiniMaxAgent.
+    Test Cases:
+        1. With a generous budget the agent finds the same forced moves as the full search
+        2. On a 4x4 board the agent returns an open position within its time budget and leaves the board unchanged
+        3. A node budget gives the same move every time
+    '''
+    # ---------- Test Case 1 ----------
+    for agent in [AlphaBetaMiniMaxAgent(pNum = 2, nodeLimit = 10**6), AlphaBetaMiniMaxAgent(pNum = 2, timeLimit = 5, ttSize = 10000)]:
+        b1 = Board()
+        b1.update(1, (0,0))
+        b1.update(2, (1,1))
+        b1.update(1, (0,1))
+        b1.update(2, (2,0))
+        assert agent.get_position(b1, 5) == (0,2)
+        b1.update(1, (1,0))
+        assert agent.get_position(b1, 6) == (0,2) # the winning move
+
+    # ---------- Test Case 2 ----------
+    b2 = Board(dim = 4)
+    b2.update(1, (0,0))
+    expected = deepcopy(b2)
+    agent = AlphaBetaMiniMaxAgent(pNum = 2, timeLimit = 0.2)
+    startTime = time.perf_counter()
+    pos = agent.get_position(b2, 2)
+    assert time.perf_counter() - startTime < 1
+    assert pos in b2.open_positions()
+    assert b2 == expected and b2.moveStack == expected.moveStack
+
+    # ---------- Test Case 3 ----------
+    agent = AlphaBetaMiniMaxAgent(pNum = 2, nodeLimit = 5000)
+    assert len({agent.get_position(b2, 2) for trial in range(3)}) == 1
+
+def test_mcts_agent():
+    '''
+    Purpose: Tests the MCTSAgent.
+    Test Cases:
+        1. The agent blocks a forced move and takes an immediate win
+        2. The subtree under the played moves is reused on the next move
+        3. The agent does not lose to the alpha beta agent
+        4. The agent returns an open position on a forced tie that is not full, including in console games that are played until the board is full
+    '''
+    random.seed(5)
+
+    # ---------- Test Case 1 ----------
+    agent2 = MCTSAgent(pNum = 2, numPlayouts = 2000)
+    b1 = Board()
+    b1.update(1, (0,0))
+    b1.update(2, (1,1))
+    b1.update(1, (0,1))
+    assert agent2.get_position(b1, 4) == (0,2)
+    b1.update(2, (2,0))
+    b1.update(1, (1,0))
+    assert MCTSAgent(pNum = 2, numPlayouts = 500).get_position(b1, 6) == (0,2)
+
+    # ---------- Test Case 2 ----------
+    agent1 = MCTSAgent(pNum = 1, numPlayouts = 500)
+    b2 = Board()
+    pos = agent1.get_position(b2, 1)
+    b2.update(1, pos)
+    b2.update(2, b2.open_positions()[0])
+    reusedRoot = agent1.reuse_root(b2)
+    assert reusedRoot.visits > 0
+    assert reusedRoot is agent1.root.children[b2.moveStack[-1][1]]
+    b2.clear()
+    assert agent1.reuse_root(b2).visits == 0
+
+    # ---------- Test Case 3 ----------
+    gsm = GameStateManager(Board(), MCTSAgent(pNum = 1, numPlayouts = 500), AlphaBetaMiniMaxAgent(pNum = 2))
+    outcome, positionSummary = gsm.run_trial()
+    assert outcome != -1
+
+    # ---------- Test Case 4 ----------
+    b3 = Board()
+    for pNum, pos in [(1,(0,0)), (2,(0,2)), (1,(1,1)), (2,(1,0)), (1,(1,2)), (2,(2,1)), (1,(2,0)), (2,(2,2))]:
+        b3.update(pNum, pos)
+    assert b3.is_auto_tie() and not b3.is_full()
+    assert MCTSAgent(pNum = 1, numPlayouts = 50).get_position(b3, 9) == (0,1)
+    for trial in range(10):
+        gsm = GameStateManager(Board(), MCTSAgent(pNum = 1, numPlayouts = 50), MCTSAgent(pNum = 2, numPlayouts = 50))
+        gsm.run_game()
+        assert gsm.board.check_win() or gsm.board.is_full()
+
+def test_alpha_beta_parallel_search():
+    '''
+    Purpose: Tests that the parallel root split of the AlphaBetaMiniMaxAgent returns the same moves as the serial search.
+    Test Cases (ran on 3x3 and 4x4 boards):
+        1. Random positions give the same move with 1 and 2 workers
+        2. The board is left unchanged
+        3. A search of depth 0 or of a forced draw returns the same open position as the serial search (with and without move ordering)
+    '''
+    random.seed(3)
+    serialAgent = AlphaBetaMiniMaxAgent(pNum = 2)
+    parallelAgent = AlphaBetaMiniMaxAgent(pNum = 2, workers = 2)
+    for n, numMoves in [(3, 1), (3, 3), (4, 7)]:
+        for trial in range(4):
+            b = Board(dim = n)
+            positions = random.sample(b.open_positions(), numMoves)
+            for i, pos in enumerate(positions):
+                b.update(i%2+1, pos)
+            if(b.check_win()):
+                continue
+            expected = deepcopy(b)
+            assert parallelAgent.get_position(b, numMoves+1) == serialAgent.get_position(b, numMoves+1) # Test Case 1
+            assert b == expected and b.moveStack == expected.moveStack # Test Case 2
+    parallelAgent.close()
+    assert AlphaBetaMiniMaxAgent(pNum = 1, maxDepth = 0, workers = 2).get_position(Board(), 1) == AlphaBetaMiniMaxAgent(pNum = 1, maxDepth = 0).get_position(Board(), 1) == (0,0) # Test Case 3
+    b = Board()
+    for pNum, pos in [(1,(0,0)), (2,(0,1)), (1,(0,2)), (2,(2,0)), (1,(2,1)), (2,(2,2))]:
+        b.update(pNum, pos)
+    assert b.is_forced_draw(1) and not b.is_auto_tie() # the middle row needs three crosses but player 1 only has two moves left
+    for moveOrdering in [None, StaticOrdering()]:
+        parallelAgent = AlphaBetaMiniMaxAgent(pNum = 1, moveOrdering = moveOrdering, workers = 2)
+        assert parallelAgent.get_position(b, 7) == AlphaBetaMiniMaxAgent(pNum = 1, moveOrdering = moveOrdering).get_position(b, 7) == (1,0) # Test Case 3
+        parallelAgent.close()
+
+def test_depth_limited_search():
+    '''
+    Purpose: Tests the maxDepth option and the static evaluation of the search agents.
+    Test Cases:
+        1. Depth-limited agents take an immediate win over blocking one on a 5x5 board
+        2. A depth-limited alpha beta agent does not lose to a random agent on a 5x5 board
+    '''
+    random.seed(4)
+    # ---------- Test Case 1 ----------
+    b1 = Board(dim = 5)
+    for j in range(4):
+        b1.update(1, (0,j))
+        b1.update(2, (4,j))
+    for agent in [MiniMaxAgent(pNum = 1, maxDepth = 1), AlphaBetaMiniMaxAgent(pNum = 1, maxDepth = 2)]:
+        assert agent.get_position(b1, 9) == (0,4)
+    for agent in [MiniMaxAgent(pNum = 2, maxDepth = 2), AlphaBetaMiniMaxAgent(pNum = 2, maxDepth = 2)]:
+        assert agent.get_position(b1, 9) == (4,4) # winning beats blocking
+
+    # ---------- Test Case 2 ----------
+    for trial in range(3):
+        gsm = GameStateManager(Board(dim = 5), AlphaBetaMiniMaxAgent(pNum = 1, maxDepth = 2), RandomAgent(pNum = 2))
+        outcome, positionSummary = gsm.run_trial()
+        assert outcome != -1
+
+def test_search_stats():
+    '''
+    Purpose: Tests the search statistics of the search agents.
+    Test Cases:
+        1. Agents created without collectStats keep no stats
+        2. The node count of a move matches nodesVisited, and alpha beta pruning cuts off branches
+        3. The max depth of a full search from the empty board is the whole game, and minimax evaluates fewer leaves than there are games (forced draws are cut short)
+        4. Transposition table lookups are counted and the totals add up the moves
+        5. The stats of a parallel search include the nodes searched by the workers
+    '''
+    # ---------- Test Case 1 ----------
+    agent = AlphaBetaMiniMaxAgent(pNum = 1)
+    agent.get_position(Board(), 1)
+    assert agent.stats is None and agent.moveStats is None
+
+    # ---------- Test Case 2 ----------
+    agent = AlphaBetaMiniMaxAgent(pNum = 1, collectStats = True)
+    agent.get_position(Board(), 1)
+    assert agent.moveStats.nodes == agent.nodesVisited
+    assert agent.moveStats.cutoffs > 0 and agent.moveStats.numSearches == 1
+    assert agent.moveStats.elapsed > 0
+
+    # ---------- Test Case 3 ----------
+    miniMaxAgent = MiniMaxAgent(pNum = 1, collectStats = True)
+    miniMaxAgent.get_position(Board(), 1)
+    assert miniMaxAgent.stats.maxDepth == 9
+    assert miniMaxAgent.stats.leafEvaluations < 255168 # number of possible tic-tac-toe games
+    assert miniMaxAgent.stats.cutoffs == 0
+
+    # ---------- Test Case 4 ----------
+    agent = AlphaBetaMiniMaxAgent(pNum = 2, ttSize = 10**5, collectStats = True)
+    b = Board()
+    b.update(1, (1,1))
+    agent.get_position(b, 2)
+    firstMove = agent.moveStats
+    assert firstMove.cacheLookups > 0 and 0 < firstMove.hit_rate() < 1
+    b.update(2, (0,0))
+    b.update(1, (2,2))
+    agent.get_position(b, 4)
+    assert agent.moveStats.hit_rate() > firstMove.hit_rate() # the table was filled by the first move
+    assert agent.stats.numSearches == 2
+    assert agent.stats.nodes == firstMove.nodes + agent.moveStats.nodes
+
+    # ---------- Test Case 5 ----------
+    parallelAgent = AlphaBetaMiniMaxAgent(pNum = 1, workers = 2, collectStats = True)
+    parallelAgent.get_position(Board(), 1)
+    assert parallelAgent.moveStats.nodes > parallelAgent.nodesVisited # the first root move is searched here, the rest in the workers
+    parallelAgent.close()
+
+def test_forced_draw_pruning(tmp_path):
+    '''
+    Purpose: Tests that the search agents stop searching positions that are a draw whatever is played.
+    Test Cases:
+        1. Both agents return an open position when the game is already a forced draw
+        2. A 4x4 position where neither player can complete a line in time is searched as a single node
+        3. The pruning does not change the values of the minimax and alpha beta searches (compared against the solved table)
+    '''
+    # ---------- Test Case 1 ----------
+    b1 = Board()
+    for pNum, pos in [(1,(0,2)), (2,(1,2)), (1,(2,2)), (2,(0,0)), (1,(0,1)), (2,(1,1)), (1,(1,0))]:
+        b1.update(pNum, pos)
+    for agent in [MiniMaxAgent(pNum = 2), AlphaBetaMiniMaxAgent(pNum = 2), AlphaBetaMiniMaxAgent(pNum = 2, nodeLimit = 100)]:
+        assert not b1.is_auto_tie() and b1.is_forced_draw(2) # the bottom row needs two more crosses but player 1 only has one move left
+        assert agent.get_position(b1, 8) in b1.open_positions()
+
+    # ---------- Test Case 2 ----------
+    b2 = Board(4)
+    for pNum, pos in [(1,(2,0)), (2,(3,2)), (1,(1,3)), (2,(3,3)), (1,(3,0)), (2,(1,1)), (1,(3,1)), (2,(2,1)), (1,(2,2)), (2,(1,0)), (1,(2,3)), (2,(1,2))]:
+        b2.update(pNum, pos)
+    assert not b2.is_auto_tie() and b2.is_forced_draw(1) # the top row is still open but needs four tokens, and each player has two moves left
+    agent = AlphaBetaMiniMaxAgent(pNum = 1, collectStats = True)
+    assert agent.get_position(b2, 13) in b2.open_positions()
+    assert agent.moveStats.nodes == 1
+
+    # ---------- Test Case 3 ----------
+    random.seed(20)
+    table = load_table(str(tmp_path / "solved_3x3.bin"))
+    for trial in range(100):
+        b = Board()
+        positions = random.sample(b.open_positions(), random.randint(0, 8))
+        for i, pos in enumerate(positions):
+            b.update(i%2+1, pos)
+        if(b.check_win()):
+            continue
+        for pNum in [1, 2]:
+            value, bestPos = lookup(table, b, pNum)
+            if(len(positions) >= 3): # minimax without pruning takes seconds on emptier boards
+                assert MiniMaxAgent(pNum).minimax(9, True, b)[0] == value
+            assert AlphaBetaMiniMaxAgent(pNum).minimax(9, True, b, -999, 999)[0] == value
+
+def test_get_positions():
+    '''
+    Purpose: Tests the batch interface of the agents.
+    Test Cases:
+        1. The default (console player) and deterministic agents return the same moves as get_position() one board at a time
+        2. Identical positions in a batch are only searched once, and symmetric ones too (without losing value) when the agent uses symmetry
+        3. The batched random and simple agents play open positions, and the simple agent still takes wins and blocks losses
+    '''
+    random.seed(23)
+    boards = []
+    for trial in range(60):
+        b = Board()
+        for i, pos in enumerate(random.sample(b.open_positions(), 2*random.randint(0, 3))):
+            b.update(i%2+1, pos)
+        if(not b.check_win()):
+            boards.append(b)
+    rounds = [len(b.moveStack)+1 for b in boards]
+
+    # ---------- Test Case 1 ----------
+    agent = AlphaBetaMiniMaxAgent(pNum = 1)
+    assert agent.get_positions(boards, rounds) == [agent.get_position(b, curRound) for b, curRound in zip(boards, rounds)]
+    class LastOpenPlayer(Player):
+        def get_position(self, board, curRound):
+            return board.open_positions()[-1]
+    assert LastOpenPlayer(pNum = 1).get_positions(boards, rounds) == [b.open_positions()[-1] for b in boards]
+
+    # ---------- Test Case 2 ----------
+    agent = AlphaBetaMiniMaxAgent(pNum = 1, collectStats = True)
+    positions = agent.get_positions(boards + boards, rounds + rounds)
+    assert positions[:len(boards)] == positions[len(boards):]
+    assert agent.stats.numSearches == len(set((b.xBits, b.oBits) for b in boards))
+    agent = AlphaBetaMiniMaxAgent(pNum = 1, useSymmetry = True, ttSize = 10**5, collectStats = True)
+    corners = []
+    for corner in [(0,0), (0,2), (2,0), (2,2)]:
+        b = Board()
+        b.update(1, (1,1))
+        b.update(2, corner)
+        corners.append(b)
+    positions = agent.get_positions(corners, 4*[3])
+    assert agent.stats.numSearches == 1
+    referenceAgent = AlphaBetaMiniMaxAgent(pNum = 1)
+    for b, pos in zip(corners, positions):
+        bestValue = referenceAgent.minimax(7, True, b, -999, 999)[0]
+        b.update(1, pos)
+        assert referenceAgent.minimax(6, False, b, -999, 999)[0] == bestValue
+
+    # ---------- Test Case 3 ----------
+    b1 = Board()
+    b1.update(1, (0,0))
+    b1.update(2, (1,1))
+    b1.update(1, (0,1))
+    b1.update(2, (2,0))
+    b2 = Board()
+    b2.update(1, (0,0))
+    b2.update(2, (1,1))
+    b2.update(1, (2,2))
+    b2.update(2, (0,1))
+    for agent in [RandomAgent(pNum = 2), SimpleAgent(pNum = 2)]:
+        for batch in [boards[:5], 20*boards]:
+            positions = agent.get_positions(batch, len(batch)*[1])
+            assert all(pos in b.open_positions() for b, pos in zip(batch, positions))
+    positions = SimpleAgent(pNum = 1).get_positions(50*[b1, b2], 100*[5])
+    assert positions == 50*[(0,2), (2,1)] # player 1 takes the win on b1 and blocks the middle column on b2
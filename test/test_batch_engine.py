@@ -0,0 +1,65 @@
+import pytest, sys, os, random
+sys.path.append(os.path.abspath(os.path.join("..", "src")))
+np = pytest.importorskip("numpy")
+from BatchEngine import *
+from Board import *
+from Agent import SimpleAgent
+
+def test_win_line_matrix():
+    '''
+    Purpose: Tests that the indicator matrix has one row per line with dim cells each.
+    '''
+    for n in range(3,7):
+        matrix = win_line_matrix(n)
+        assert matrix.shape == (2*n+2, n*n)
+        assert (matrix.sum(axis = 1) == n).all()
+
+def test_batch_games_replay():
+    '''
+    Purpose: Tests that the batched games are legal games whose outcomes match a replay on the Board class.
+    Test Cases (ran on board dimensions 3 and 4, with every pair of policies):
+        1. Every move is played on an open cell
+        2. The game stops at the first win and the outcome matches the replayed board
+    '''
+    for n in [3, 4]:
+        for policy1, policy2 in [("random", "random"), ("simple", "random"), ("random", "simple"), ("simple", "simple")]:
+            engine = BatchEngine(200, n, policy1, policy2, seed = 1)
+            outcomes = engine.run()
+            for game in range(200):
+                b = Board(dim = n)
+                for ply, idx in enumerate(engine.moves[game]):
+                    if(idx < 0):
+                        break
+                    assert not b.check_win() # Test Case 2
+                    b.update(ply%2+1, (int(idx)//n, int(idx)%n)) # Test Case 1
+                assert b.game_state() == outcomes[game] # Test Case 2
+
+def test_batch_outcome_frequencies():
+    '''
+    Purpose: Tests that the batched policies match the exact outcome probabilities of RandomAgent and SimpleAgent on 3x3 (see test_simulation.py).
+    '''
+    engine = BatchEngine(50000, 3, "random", "random", seed = 2)
+    engine.run()
+    for count, exact in zip(engine.outcome_summary(), [737/1260, 121/420, 8/63]):
+        assert abs(count/50000 - exact) < 0.01
+
+    engine = BatchEngine(50000, 3, "simple", "random", seed = 2)
+    engine.run()
+    for count, exact in zip(engine.outcome_summary(), [0.89555, 0.01310, 0.09136]):
+        assert abs(count/50000 - exact) < 0.01
+
+def test_batch_move_distribution():
+    '''
+    Purpose: Tests that the batched simple policy picks among the winning cells like the SimpleAgent, also when one of them blocks as well.
+    '''
+    random.seed(16)
+    b = Board()
+    for pNum, pos in [(1,(0,0)), (2,(1,1)), (1,(0,1)), (2,(1,2)), (1,(1,0)), (2,(2,2))]:
+        b.update(pNum, pos)
+    assert set(b.winning_positions(1)) == {(0,2), (2,0)} and (0,2) in b.losing_positions(1) # (0,2) wins and blocks, (2,0) only wins
+    agent = SimpleAgent(pNum = 1)
+    loopMoves = [agent.get_position(b, 7) for trial in range(2000)]
+    batchMoves = agent.get_positions(2000*[b], 2000*[7])
+    for moves in [loopMoves, batchMoves]:
+        assert set(moves) == {(0,2), (2,0)}
+        assert abs(moves.count((0,2))/2000 - 0.5) < 0.05
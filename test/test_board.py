@@ -316,3 +316,254 @@ def test_losing_positions():
     b1.update(1, (0,1))
     b1.update(2, (2,0))
     assert b1.losing_positions(2) == [(0,2)]
+
+def test_threats():
+    '''
+    Purpose: Tests the single pass threat scan of the board class.
+    Test Cases (ran on board dimensions ranging from 3 to 5):
+        1. A cell is in xThreats (oThreats) exactly when playing a cross (nought) there completes a line
+        2. threat_positions() lists the same cells from the point of view of each player
+    '''
+    random.seed(19)
+    for n in range(3,6):
+        for trial in range(100):
+            b = Board(n)
+            positions = random.sample(b.open_positions(), random.randint(0, n*n-1))
+            for i, pos in enumerate(positions):
+                b.push(i%2+1, pos)
+                if(b.check_win()):
+                    b.pop()
+                    break
+            xThreats, oThreats = b.threats()
+            expected = {1: [], 2: []}
+            for pNum in [1, 2]:
+                for pos in b.open_positions():
+                    b.push(pNum, pos)
+                    if(b.check_win()):
+                        expected[pNum].append(pos)
+                    b.pop()
+            for pNum, threats in [(1, xThreats), (2, oThreats)]:
+                assert [pos for pos in b.open_positions() if (threats >> (pos[0]*n + pos[1])) & 1] == expected[pNum] # Test Case 1
+            assert b.threat_positions(1) == (expected[1], expected[2]) # Test Case 2
+            assert b.threat_positions(2) == (expected[2], expected[1]) # Test Case 2
+
+def test_live_line_needs():
+    '''
+    Purpose: Tests the live line histograms and the forced draw check of the board class.
+    Test Cases (ran on board dimensions ranging from 3 to 5):
+        1. xNeeds and oNeeds match a recount of the lines after every push and pop
+        2. is_forced_draw() matches a recount of the lines that can be completed with the moves that are left
+        3. A full board and an auto tie are forced draws
+    '''
+    random.seed(20)
+    for n in range(3,6):
+        for trial in range(30):
+            b = Board(n)
+            positions = random.sample(b.open_positions(), n*n)
+            for i, pos in enumerate(positions):
+                b.push(i%2+1, pos)
+                if(i%3 == 2):
+                    b.pop()
+                    b.push(i%2+1, pos)
+                for counts, otherCounts, needs in [(b.xCounts, b.oCounts, b.xNeeds), (b.oCounts, b.xCounts, b.oNeeds)]:
+                    expected = (n+1)*[0]
+                    for count, otherCount in zip(counts, otherCounts):
+                        if(otherCount == 0):
+                            expected[n-count] += 1
+                    assert needs == expected # Test Case 1
+                pNum = (i+1)%2 + 1
+                numOpen = n*n - (i+1)
+                movesLeft = {pNum: (numOpen+1)//2, pNum%2+1: numOpen//2}
+                winnable = any(oCount == 0 and n - xCount <= movesLeft[1] for xCount, oCount in zip(b.xCounts, b.oCounts))
+                winnable = winnable or any(xCount == 0 and n - oCount <= movesLeft[2] for xCount, oCount in zip(b.xCounts, b.oCounts))
+                assert b.is_forced_draw(pNum) == (not winnable) # Test Case 2
+                if(b.is_auto_tie()):
+                    assert b.is_forced_draw(pNum) # Test Case 3
+            assert b.check_win() or b.is_forced_draw(1) # Test Case 3
+
+def test_line_masks():
+    '''
+    Purpose: Tests the win-line bitmask table used by the Board class.
+    Test Cases (ran on board dimensions ranging from 3 to 10):
+        1. There are 2*dim+2 lines (expected to hold dim cells each)
+        2. Every cell is covered by at least one line
+    '''
+    for n in range(3,11):
+        masks = line_masks(n)
+        assert len(masks) == 2*n+2 # Test Case 1
+        assert all(bin(mask).count("1") == n for mask in masks) # Test Case 1
+        coveredCells = 0
+        for mask in masks:
+            coveredCells |= mask
+        assert coveredCells == (1 << n*n) - 1 # Test Case 2
+
+def test_is_auto_tie():
+    '''
+    Purpose: Tests the is_auto_tie() function of the board class
+    Test Cases:
+        1. Empty board (expected to return False)
+        2. Board where every line holds both tokens but is not full (expected to return True)
+    '''
+    b1 = Board()
+    assert b1.is_auto_tie() == False # Test Case 1
+
+    b2 = Board()
+    for pNum, pos in [(1,(0,0)), (2,(0,2)), (1,(0,1)), (2,(1,0)), (1,(1,2)), (2,(2,1)), (1,(2,0)), (2,(2,2))]:
+        b2.update(pNum, pos)
+    assert b2.is_full() == False
+    assert b2.is_auto_tie() == True # Test Case 2
+
+def test_push_pop():
+    '''
+    Purpose: Tests the push() and pop() move stack of the Board class.
+    Test Cases (ran on board dimensions ranging from 3 to 10):
+        1. Pushing moves places the tokens in the same way update() does
+        2. Popping every move restores the board to its original state and returns the moves in reverse order
+    '''
+    for n in range(3,11):
+        b = Board(dim = n)
+        expected = Board(dim = n)
+        b.update(1, (0,0))
+        expected.update(1, (0,0))
+        positions = random.sample(b.open_positions(), random.randint(1, n**2-1))
+        pNum = 2
+        for pos in positions:
+            b.push(pNum, pos)
+            expected.update(pNum, pos)
+            pNum = pNum%2+1
+        assert b == expected # Test Case 1
+
+        for pos in reversed(positions):
+            pNum = pNum%2+1
+            assert b.pop() == (pNum, pos) # Test Case 2
+        assert b.board[0][0] == Token.CROSS
+        assert b.open_positions() == Board(dim = n).open_positions()[1:] # Test Case 2
+
+def test_line_counters():
+    '''
+    Purpose: Tests that the per-line counters kept by push() and pop() agree with a full scan of the board.
+    Test Cases (ran on board dimensions ranging from 3 to 6):
+        1. game_state(), last_move_won() and is_auto_tie() agree with the line masks after every push
+        2. The counters return to zero after popping every move
+    '''
+    def scan(b):
+        state, allDead = 0, True
+        for mask in b.lineMasks:
+            if(state == 0 and (b.xBits & mask) == mask):
+                state = 1
+            if(state == 0 and (b.oBits & mask) == mask):
+                state = -1
+            if(not ((b.xBits & mask) and (b.oBits & mask))):
+                allDead = False
+        return state, allDead
+
+    for n in range(3,7):
+        b = Board(dim = n)
+        positions = random.sample(b.open_positions(), n**2)
+        pNum = 1
+        for pos in positions:
+            stateBefore = b.game_state()
+            b.push(pNum, pos)
+            state, allDead = scan(b)
+            assert (b.game_state() != 0) == (state != 0) # Test Case 1
+            assert b.is_auto_tie() == allDead # Test Case 1
+            if(stateBefore == 0):
+                assert b.last_move_won() == (state != 0) # Test Case 1
+            pNum = pNum%2+1
+        while(b.moveStack):
+            b.pop()
+        assert b.xCounts == b.oCounts == len(b.lineMasks)*[0] # Test Case 2
+        assert b.xWins == b.oWins == b.deadLines == 0 # Test Case 2
+
+def test_board_hash():
+    '''
+    Purpose: Tests the Zobrist hash and equality of the Board class.
+    Test Cases (ran on board dimensions ranging from 3 to 10):
+        1. The same position reached through different move orders is equal and has the same hash
+        2. Popping and clearing restore the hash of the earlier position
+        3. Boards can be used as set members
+        4. Boards of different dimensions do not share hashes, even when empty
+    '''
+    for n in range(3,11):
+        b1 = Board(dim = n)
+        b2 = Board(dim = n)
+        emptyHash = hash(b1)
+        positions = random.sample(b1.open_positions(), random.randint(2, n**2))
+        moves = [(i%2+1, pos) for i, pos in enumerate(positions)]
+        for pNum, pos in moves:
+            b1.update(pNum, pos)
+        for pNum, pos in reversed(moves):
+            b2.push(pNum, pos)
+        assert b1 == b2 and hash(b1) == hash(b2) # Test Case 1
+
+        b2.pop()
+        assert b1 != b2 # Test Case 2
+        b2.push(*moves[0])
+        assert hash(b1) == hash(b2) # Test Case 2
+        b1.clear()
+        assert hash(b1) == emptyHash # Test Case 2
+        assert len({b1, b2, Board(dim = n)}) == 2 # Test Case 3
+    assert len({hash(Board(dim = n)) for n in range(3,11)}) == 8 # Test Case 4
+
+def test_canonical_key():
+    '''
+    Purpose: Tests the symmetry canonicalization of the Board class.
+    Test Cases (ran on board dimensions ranging from 3 to 6):
+        1. All 8 rotations and reflections of a position have the same canonical key
+        2. Mapping the board with the returned transform gives the canonical position
+        3. unmap_position() undoes map_position()
+    '''
+    for n in range(3,7):
+        b = Board(dim = n)
+        positions = random.sample(b.open_positions(), random.randint(1, n**2))
+        for i, pos in enumerate(positions):
+            b.update(i%2+1, pos)
+        canonicalKey, transform = b.canonical_key()
+
+        for permutation in symmetry_permutations(n):
+            symmetricBoard = Board(dim = n)
+            for i, pos in enumerate(positions):
+                newIdx = permutation[pos[0]*n + pos[1]]
+                symmetricBoard.update(i%2+1, (newIdx//n, newIdx%n))
+            assert symmetricBoard.canonical_key()[0] == canonicalKey # Test Case 1
+
+        canonicalBoard = Board(dim = n)
+        for i, pos in enumerate(positions):
+            canonicalBoard.update(i%2+1, b.map_position(pos, transform))
+        assert (canonicalBoard.xBits, canonicalBoard.oBits) == canonicalKey # Test Case 2
+
+        for t in range(8):
+            for pos in cell_positions(n):
+                assert b.unmap_position(b.map_position(pos, t), t) == pos # Test Case 3
+
+def test_line_score():
+    '''
+    Purpose: Tests the line_score() static evaluation of the Board class.
+    Test Cases (ran on board dimensions ranging from 3 to 10):
+        1. The empty board scores 0
+        2. A lone cross scores above 0 and a lone nought below 0 (by the same amount)
+        3. Two crosses on one line outweigh two crosses on different lines
+        4. The score stays strictly between -1 and 1
+    '''
+    for n in range(3,11):
+        b = Board(dim = n)
+        assert b.line_score() == 0 # Test Case 1
+        b.update(1, (0,1))
+        crossScore = b.line_score()
+        b.clear()
+        b.update(2, (0,1))
+        assert crossScore > 0 and b.line_score() == -crossScore # Test Case 2
+
+        sameLine = Board(dim = n)
+        sameLine.update(1, (1,0))
+        sameLine.update(1, (1,2))
+        differentLines = Board(dim = n)
+        differentLines.update(1, (1,0))
+        differentLines.update(1, (2,2))
+        assert sameLine.line_score() > differentLines.line_score() # Test Case 3
+
+        full = Board(dim = n)
+        for i in range(n):
+            for j in range(n-1):
+                full.update(1, (i,j))
+        assert 0 < full.line_score() < 1 # Test Case 4
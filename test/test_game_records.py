@@ -0,0 +1,81 @@
+import pytest, sys, os, random
+sys.path.append(os.path.abspath(".."))
+sys.path.append(os.path.abspath(os.path.join("..", "src")))
+from GameRecords import *
+from Simulation import *
+
+def test_game_records(tmp_path):
+    '''
+    Purpose: Tests writing and reading game record files.
+    Test Cases:
+        1. The trials streamed from a simulation are read back unchanged, in any order, along with the header
+        2. Appending to an existing file keeps the earlier trials, and a file of other agents or dim is rejected
+        3. Every trial takes one byte per move plus an outcome byte, and 8 bytes in the index
+        4. Records without an index entry are indexed when the file is opened again, and an unfinished last record is cut off
+        5. A missing index file is rebuilt from the records, and invalid records are rejected without changing the file
+    '''
+    path = str(tmp_path / "trials.bin")
+    sim = Simulation(4, SimpleAgent(1), RandomAgent(2), 50, seed = 24)
+    with sim.record_sink(path) as sink:
+        simData = list(sim.iter_trials(sink = sink))
+    with GameRecordReader(path) as reader:
+        assert reader.dim == 4 and reader.agentNames == ["Simple Agent", "Random Agent"] # Test Case 1
+        assert len(reader) == 50
+        assert [reader[i] for i in [49, 0, 17, -1]] == [simData[i] for i in [49, 0, 17, -1]] # Test Case 1
+        assert list(reader) == simData # Test Case 1
+
+    # ---------- Test Case 2 ----------
+    moreData = list(Simulation(4, SimpleAgent(1), RandomAgent(2), 10, seed = 25).iter_trials(sink = sim.record_sink(path)))
+    with GameRecordReader(path) as reader:
+        assert list(reader) == simData + moreData
+    with pytest.raises(Exception):
+        GameRecordSink(path, 4, ["Random Agent", "Random Agent"])
+    with pytest.raises(Exception):
+        GameRecordSink(path, 3, ["Simple Agent", "Random Agent"])
+
+    # ---------- Test Case 3 ----------
+    numMoves = sum(len(trialData[1]) for trialData in simData + moreData)
+    assert os.path.getsize(path) == len(record_header(4, ["Simple Agent", "Random Agent"])) + 60 + numMoves
+    assert os.path.getsize(index_path(path)) == 8*60
+
+    # ---------- Test Case 4 ----------
+    with open(path, "ab") as f:
+        f.write(bytes([1, 0, 4, 1, 5, 2, 6, 3])) # player 1 completes the top row
+        f.write(bytes([2, 5, 0])) # cut off after two moves
+    with GameRecordReader(path) as reader:
+        assert len(reader) == 60
+    with GameRecordSink(path, 4, ["Simple Agent", "Random Agent"]) as sink:
+        sink.write_moves(-1, [0, 4, 1, 5, 2, 6, 8, 7])
+    with GameRecordReader(path) as reader:
+        assert len(reader) == 62 and reader[59] == moreData[-1]
+        assert reader.moves(60) == (1, bytes([0, 4, 1, 5, 2, 6, 3]))
+        assert reader.moves(61) == (-1, bytes([0, 4, 1, 5, 2, 6, 8, 7]))
+        records = list(reader)
+
+    # ---------- Test Case 5 ----------
+    dataSize = os.path.getsize(path)
+    os.remove(index_path(path))
+    GameRecordSink(path, 4, ["Simple Agent", "Random Agent"]).close()
+    assert os.path.getsize(path) == dataSize and os.path.getsize(index_path(path)) == 8*62
+    with GameRecordReader(path) as reader:
+        assert list(reader) == records
+    with open(path, "ab") as f:
+        f.write(bytes([1, 0, 0]))
+    os.remove(index_path(path))
+    with pytest.raises(Exception):
+        GameRecordSink(path, 4, ["Simple Agent", "Random Agent"])
+    assert os.path.getsize(path) == dataSize + 3
+
+def test_record_trial_visualizer(tmp_path, capsys):
+    '''
+    Purpose: Tests that trial_visualizer() replays a trial from a game record file like the trial itself.
+    '''
+    path = str(tmp_path / "trials.bin")
+    sim = Simulation(3, RandomAgent(1), RandomAgent(2), 20, seed = 26)
+    with sim.record_sink(path) as sink:
+        simData = list(sim.iter_trials(sink = sink))
+    capsys.readouterr()
+    sim.trial_visualizer(simData[6])
+    expected = capsys.readouterr().out
+    sim.trial_visualizer(7, recordPath = path)
+    assert capsys.readouterr().out == expected
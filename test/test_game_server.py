@@ -0,0 +1,80 @@
+import pytest, sys, os, asyncio, random
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.abspath(".."))
+sys.path.append(os.path.abspath(os.path.join("..", "src")))
+from GameServer import *
+import GameServer
+
+async def play_random_game(port, agent, player, dim = 3):
+    '''
+    Purpose: Plays one game with random client moves and returns the final response.
+    '''
+    client = await GameClient.connect(port = port)
+    response = await client.request(op = "new", dim = dim, agent = agent, player = player)
+    while(not response["over"]):
+        openCells = [idx for idx, cell in enumerate(response["cells"]) if cell == "."]
+        idx = random.choice(openCells)
+        response = await client.request(op = "move", game = response["game"], pos = [idx//dim, idx%dim])
+        assert response["ok"]
+    await client.close()
+    return response
+
+def test_game_server(monkeypatch):
+    '''
+    Purpose: Tests the session manager of the game server against local clients.
+    Test Cases:
+        1. Games against the executor agents are played to the end, and the alpha beta agent never loses (in either seat)
+        2. Many games run concurrently in one event loop and finished games are removed
+        3. Invalid requests get an error response with the id of the request, and the games of a client are removed when it disconnects
+        4. Agents are rejected on boards they do not support, and a failed agent move leaves no game behind or takes the move of the client back
+    '''
+    random.seed(22)
+    async def run():
+        manager = SessionManager(ThreadPoolExecutor(max_workers = 2))
+        server = await manager.serve(port = 0)
+        port = server.sockets[0].getsockname()[1]
+        # ---------- Test Case 1 ----------
+        for player in [1, 2]:
+            for trial in range(3):
+                response = await play_random_game(port, "alphabeta", player)
+                assert response["outcome"] != (1 if player == 1 else -1)
+
+        # ---------- Test Case 2 ----------
+        responses = await asyncio.gather(*[play_random_game(port, "simple", 1 + game%2) for game in range(200)])
+        assert all(response["over"] for response in responses)
+        assert len(manager.sessions) == 0
+
+        # ---------- Test Case 3 ----------
+        client = await GameClient.connect(port = port)
+        assert (await client.request(op = "new", agent = "unknown", id = 7)) == {"ok": False, "error": (await client.request(op = "new", agent = "unknown"))["error"], "id": 7}
+        response = await client.request(op = "new", agent = "random", player = 1)
+        assert not (await client.request(op = "move", game = response["game"], pos = [5, 5]))["ok"]
+        assert not (await client.request(op = "move", game = response["game"] + 1, pos = [0, 0]))["ok"]
+        assert not (await client.request(op = "fly"))["ok"]
+        assert len(manager.sessions) == 1
+        await client.close()
+        await asyncio.sleep(0.05)
+        assert len(manager.sessions) == 0
+
+        # ---------- Test Case 4 ----------
+        client = await GameClient.connect(port = port)
+        for agent, dim in [("solved", 4), ("retrograde", 5), ("minimax", 10)]:
+            assert not (await client.request(op = "new", dim = dim, agent = agent, player = 2))["ok"]
+        assert len(manager.sessions) == 0
+        def failing_move(*args):
+            raise Exception("The agent failed.")
+        monkeypatch.setattr(GameServer, "agent_move", failing_move)
+        assert (await client.request(op = "new", agent = "alphabeta", player = 2))["error"] == "The agent failed."
+        assert len(manager.sessions) == 0
+        response = await client.request(op = "new", agent = "alphabeta", player = 1)
+        assert not (await client.request(op = "move", game = response["game"], pos = [0, 0]))["ok"]
+        monkeypatch.undo()
+        state = await client.request(op = "state", game = response["game"])
+        assert state["cells"] == "........." and state["turn"] == 1
+        assert (await client.request(op = "move", game = response["game"], pos = [0, 0]))["ok"]
+        await client.close()
+
+        server.close()
+        await server.wait_closed()
+        manager.close()
+    asyncio.run(run())
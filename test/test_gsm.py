@@ -0,0 +1,75 @@
+import pytest, sys, os, random
+sys.path.append(os.path.abspath(os.path.join("..", "src")))
+from GameStateManager import *
+
+def test_run_trial():
+    '''
+    Purpose: Tests the run_trial() function of the GameStateManager class.
+    Test Cases (ran on board dimensions ranging from 3 to 5):
+        1. The trial is played until the game is won or a tie is forced
+        2. The outcome matches the final board and the moves alternate between the players
+    '''
+    for n in range(3,6):
+        for trial in range(20):
+            board = Board(dim = n)
+            gsm = GameStateManager(board, RandomAgent(pNum = 1), RandomAgent(pNum = 2))
+            outcome, positionSummary = gsm.run_trial()
+            assert board.check_win() or board.is_auto_tie() # Test Case 1
+            assert outcome == board.game_state() # Test Case 2
+
+            replay = Board(dim = n)
+            for curRound in positionSummary:
+                replay.update(2 - curRound%2, positionSummary[curRound])
+                if(curRound < len(positionSummary)):
+                    assert not replay.check_win() and not replay.is_auto_tie() # Test Case 1
+            assert replay == board # Test Case 2
+
+def test_run_headless():
+    '''
+    Purpose: Tests the run_headless() game loop of the GameStateManager class.
+    Test Cases:
+        1. The moves written to the buffer replay the game, and the outcome matches run_trial() for the same random seed
+        2. A reused board and buffer give the same games as fresh ones
+        3. A position that is already taken is rejected
+        4. Managers created without arguments do not share a board
+    '''
+    board = Board()
+    gsm = GameStateManager(board, RandomAgent(pNum = 1), SimpleAgent(pNum = 2))
+    moves = move_buffer(3)
+    for trial in range(20):
+        board.clear()
+        random.seed(trial)
+        outcome, numMoves = gsm.run_headless(moves)
+        random.seed(trial)
+        expected = GameStateManager(Board(), RandomAgent(pNum = 1), SimpleAgent(pNum = 2)).run_trial()
+        assert outcome == expected[0] # Test Case 1
+        assert [cell_positions(3)[idx] for idx in moves[:numMoves]] == list(expected[1].values()) # Test Case 1, 2
+
+    class RepeatAgent(Player):
+        def get_position(self, board, curRound):
+            return (1,1)
+    with pytest.raises(Exception):
+        GameStateManager(Board(), RepeatAgent(pNum = 1), RepeatAgent(pNum = 2)).run_headless(move_buffer(3)) # Test Case 3
+
+    assert GameStateManager().board is not GameStateManager().board # Test Case 4
+
+def test_run_lockstep():
+    '''
+    Purpose: Tests the run_lockstep() batch mode of the GameStateManager class.
+    Test Cases (ran on board dimensions 3 and 4):
+        1. Every game is played until it is won or a tie is forced, and its moves replay to its outcome
+        2. Batches of deterministic agents play the same games as run_trial()
+    '''
+    random.seed(23)
+    for n in [3, 4]:
+        gsm = GameStateManager(Board(n), SimpleAgent(pNum = 1), RandomAgent(pNum = 2))
+        for outcome, positionSummary in gsm.run_lockstep(100):
+            replay = Board(dim = n)
+            for curRound in positionSummary:
+                assert not replay.check_win() and not replay.is_auto_tie() # Test Case 1
+                replay.update(2 - curRound%2, positionSummary[curRound])
+            assert replay.check_win() or replay.is_auto_tie() # Test Case 1
+            assert outcome == replay.game_state() # Test Case 1
+
+    gsm = GameStateManager(Board(), AlphaBetaMiniMaxAgent(pNum = 1), AlphaBetaMiniMaxAgent(pNum = 2))
+    assert gsm.run_lockstep(3) == 3*[list(GameStateManager(Board(), AlphaBetaMiniMaxAgent(pNum = 1), AlphaBetaMiniMaxAgent(pNum = 2)).run_trial())] # Test Case 2
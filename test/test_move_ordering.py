@@ -0,0 +1,61 @@
+import pytest, sys, os, random
+sys.path.append(os.path.abspath(os.path.join("..", "src")))
+from Agent import *
+
+def test_static_ordering():
+    '''
+    Purpose: Tests that the StaticOrdering searches the center first and the corners next on a 3x3 board.
+    '''
+    b = Board()
+    positions = StaticOrdering().order(b, b.open_positions(), 1, 0)
+    assert positions[0] == (1,1)
+    assert set(positions[1:5]) == {(0,0), (0,2), (2,0), (2,2)}
+
+def test_threat_ordering():
+    '''
+    Purpose: Tests that the ThreatOrdering searches immediate wins first and blocks next.
+    '''
+    b = Board()
+    b.update(1, (0,0))
+    b.update(2, (1,1))
+    b.update(1, (0,1))
+    b.update(2, (2,2))
+    b.update(1, (1,0))
+    assert ThreatOrdering().order(b, b.open_positions(), 1, 5)[0:2] == [(0,2), (2,0)] # both win for player 1
+    positions = ThreatOrdering().order(b, b.open_positions(), 2, 5)
+    assert set(positions[0:2]) == {(0,2), (2,0)} # player 2 has to block
+
+def test_killer_and_history():
+    '''
+    Purpose: Tests that the KillerMoves and HistoryHeuristic orderings search the moves that caused cutoffs first.
+    '''
+    b = Board()
+    killers = KillerMoves()
+    killers.cutoff(b, (2,1), 1, 0, 3)
+    killers.cutoff(b, (0,1), 1, 0, 3)
+    assert killers.order(b, b.open_positions(), 1, 0)[0:2] == [(0,1), (2,1)]
+    assert killers.order(b, b.open_positions(), 1, 1) == b.open_positions()
+
+    history = HistoryHeuristic()
+    history.cutoff(b, (2,1), 1, 0, 1)
+    history.cutoff(b, (1,2), 1, 0, 3)
+    assert history.order(b, b.open_positions(), 1, 0)[0:2] == [(1,2), (2,1)]
+    assert history.order(b, b.open_positions(), 2, 0) == b.open_positions()
+
+def test_ordering_node_counts():
+    '''
+    Purpose: Tests that move ordering reduces the number of nodes searched without changing the agent's play.
+    Test Cases:
+        1. The default ordering searches fewer nodes than the unordered search on the empty 3x3 board
+        2. An agent with the default ordering still blocks the forced move
+    '''
+    unorderedNodes, orderedNodes = ordering_node_counts(Board(), 1, 9, default_move_ordering())
+    assert orderedNodes < unorderedNodes # Test Case 1
+
+    agent = AlphaBetaMiniMaxAgent(pNum = 1, moveOrdering = default_move_ordering())
+    b1 = Board()
+    b1.update(1, (0,0))
+    b1.update(2, (1,1))
+    b1.update(1, (0,1))
+    b1.update(2, (2,0))
+    assert agent.get_position(b1, 5) == (0,2) # Test Case 2
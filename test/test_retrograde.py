@@ -0,0 +1,74 @@
+import pytest, sys, os, random
+sys.path.append(os.path.abspath(os.path.join("..", "src")))
+np = pytest.importorskip("numpy")
+from Retrograde import *
+from SolvedTable import solve_table
+from Agent import *
+
+def test_solve_retrograde():
+    '''
+    Purpose: Tests the retrograde values of the 3x3 board against the solved table.
+    Test Cases:
+        1. The empty board is a tie
+        2. Positions with impossible token counts are unreachable
+        3. Every position where at most the last mover has a line has the same value as in the solved table
+    '''
+    values = solve_retrograde(3)
+    solved = solve_table(3)
+    assert values[0] == TIE # Test Case 1
+    assert values[2] == values[1 + 3] == 0 # Test Case 2: a lone nought, and two crosses
+    for index in range(3**9):
+        if(values[index] == 0):
+            continue
+        cells = [index//3**idx%3 for idx in range(9)]
+        pNum = 1 if cells.count(1) == cells.count(2) else 2
+        b = Board()
+        for idx, token in enumerate(cells):
+            if(token):
+                b.update(token, (idx//3, idx%3))
+        if(b.xWins and b.oWins):
+            continue # unreachable, and the solved table scores it from player 1's side
+        assert int(values[index]) - 2 == (solved[2*index + pNum - 1] >> 6) - 1 # Test Case 3
+
+def test_retrograde_table(tmp_path):
+    '''
+    Purpose: Tests the packed table file and its lookups.
+    Test Cases:
+        1. The packed values match the solved values
+        2. The table file is written once and then reused
+        3. The best move of a position achieves its value
+    '''
+    path = str(tmp_path / "retrograde_3x3.bin")
+    table = load_retrograde_table(path, 3)
+    modifiedTime = os.path.getmtime(path)
+    values = solve_retrograde(3)
+    assert all(retrograde_value(table, index) == values[index] for index in range(3**9)) # Test Case 1
+    load_retrograde_table(path, 3)
+    assert os.path.getmtime(path) == modifiedTime # Test Case 2
+
+    b = Board()
+    b.update(1, (0,0))
+    b.update(2, (1,1))
+    b.update(1, (0,1))
+    assert retrograde_best_move(table, b) == (0, (0,2)) # Test Case 3: player 2 has to block
+
+def test_retrograde_agent(tmp_path):
+    '''
+    Purpose: Tests that the RetrogradeAgent rejects other board sizes and never loses to a random agent.
+    '''
+    path = str(tmp_path / "retrograde_3x3.bin")
+    agent1 = RetrogradeAgent(pNum = 1, dim = 3, tablePath = path)
+    with pytest.raises(Exception):
+        agent1.get_position(Board(4), 1)
+
+    for trial in range(20):
+        board = Board()
+        opponent = RandomAgent(pNum = 2)
+        curRound = 1
+        while(not board.check_win() and not board.is_full()):
+            if(curRound%2 == 1):
+                board.update(1, agent1.get_position(board, curRound))
+            else:
+                board.update(2, opponent.get_position(board, curRound))
+            curRound += 1
+        assert board.game_state() != -1
@@ -0,0 +1,109 @@
+import pytest, sys, os, random
+sys.path.append(os.path.abspath(os.path.join("..", "src")))
+sys.path.append(os.path.abspath(".."))
+from Simulation import *
+
+def test_run_simulation():
+    '''
+    Purpose: Tests the run_simulation() and outcome_summary() functions of the Simulation class.
+    Test Cases:
+        1. The simulation returns one [outcome, positionSummary] entry per trial
+        2. The outcome summary adds up to the sample size
+    '''
+    sim = Simulation(3, RandomAgent(1), SimpleAgent(2), 25)
+    simData = sim.run_simulation()
+    assert len(simData) == 25 # Test Case 1
+    assert all(d[0] in [-1, 0, 1] and len(d[1]) >= 5 for d in simData) # Test Case 1
+    assert sum(sim.outcome_summary(simData)) == 25 # Test Case 2
+
+def test_parallel_simulation():
+    '''
+    Purpose: Tests that seeded simulations are reproducible whatever the number of workers.
+    Test Cases:
+        1. Running the same seed twice gives the same data
+        2. Running with 1, 2 and 3 workers gives the same data in the same trial order
+    '''
+    serialData = Simulation(3, RandomAgent(1), RandomAgent(2), 40, seed = 7).run_simulation()
+    assert serialData == Simulation(3, RandomAgent(1), RandomAgent(2), 40, seed = 7).run_simulation() # Test Case 1
+    for workers in [2, 3]:
+        sim = Simulation(3, RandomAgent(1), RandomAgent(2), 40, workers = workers, seed = 7)
+        assert sim.run_simulation() == serialData # Test Case 2
+
+def test_iter_trials(tmp_path):
+    '''
+    Purpose: Tests the streaming iter_trials() API, the OutcomeAggregator and the JSONLSink.
+    Test Cases:
+        1. iter_trials() yields the same trials as run_simulation() for the same seed
+        2. outcome_summary() works on the generator and matches an OutcomeAggregator
+        3. The trials written to the sink can be read back unchanged
+    '''
+    sim = Simulation(3, RandomAgent(1), SimpleAgent(2), 30, seed = 3)
+    simData = sim.run_simulation()
+    assert list(sim.iter_trials()) == simData # Test Case 1
+    assert sim.outcome_summary(sim.iter_trials()) == sim.outcome_summary(simData) # Test Case 2
+
+    aggregator = OutcomeAggregator()
+    path = str(tmp_path / "trials.jsonl")
+    with JSONLSink(path) as sink:
+        for trialData in sim.iter_trials(sink = sink):
+            aggregator.add(trialData)
+    assert aggregator.summary() == sim.outcome_summary(simData) # Test Case 2
+    assert aggregator.num_trials() == 30
+    assert list(read_jsonl_trials(path)) == simData # Test Case 3
+
+def test_exact_outcome_distribution():
+    '''
+    Purpose: Tests the exact_outcome_distribution() function.
+    Test Cases:
+        1. Two random agents on 3x3 match the known exact probabilities (737/1260, 121/420, 8/63)
+        2. The probabilities of every matchup add up to 1
+        3. A minimax agent never loses, and the sampled frequencies of a stochastic matchup are close to the exact ones
+        4. Agents without an exact move distribution are rejected
+    '''
+    assert exact_outcome_distribution(RandomAgent(1), RandomAgent(2)) == [Fraction(737, 1260), Fraction(121, 420), Fraction(8, 63)] # Test Case 1
+
+    distribution = exact_outcome_distribution(AlphaBetaMiniMaxAgent(1), SimpleAgent(2))
+    assert sum(distribution) == 1 # Test Case 2
+    assert distribution[1] == 0 # Test Case 3
+
+    sim = Simulation(3, SimpleAgent(1), RandomAgent(2), 2000, seed = 11)
+    exactSummary = sim.exact_outcome_summary()
+    assert sum(exactSummary) == 1 # Test Case 2
+    sampledSummary = sim.outcome_summary(sim.iter_trials())
+    for exact, sampled in zip(exactSummary, sampledSummary):
+        assert abs(exact - sampled/2000) < 0.05 # Test Case 3
+
+    with pytest.raises(Exception):
+        exact_outcome_distribution(MCTSAgent(1, numPlayouts = 10), RandomAgent(2)) # Test Case 4
+
+def test_simulation_search_stats():
+    '''
+    Purpose: Tests that the simulation adds up the search stats of its agents.
+    Test Cases:
+        1. Agents that do not collect stats have no entry
+        2. The stats of a run count every move of the search agent, whether or not the trials are split across workers
+    '''
+    agent1 = AlphaBetaMiniMaxAgent(1, collectStats = True)
+    sim = Simulation(3, agent1, RandomAgent(2), 10, seed = 5)
+    simData = sim.run_simulation()
+    assert sim.searchStats[1] is None # Test Case 1
+    numMoves = sum((len(trialData[1]) + 1)//2 for trialData in simData)
+    assert sim.searchStats[0].numSearches == numMoves == agent1.stats.numSearches # Test Case 2
+
+    parallelSim = Simulation(3, AlphaBetaMiniMaxAgent(1, collectStats = True), RandomAgent(2), 10, workers = 2, seed = 5)
+    parallelSim.run_simulation()
+    assert parallelSim.searchStats[0].numSearches == numMoves # Test Case 2
+    assert parallelSim.searchStats[0].nodes == sim.searchStats[0].nodes
+
+def test_simulation_batches():
+    '''
+    Purpose: Tests simulations that play their trials in lockstep batches.
+    Test Cases:
+        1. A seeded batched simulation is reproducible and does not depend on workers
+        2. Every trial is played and the outcomes add up to the sample size
+    '''
+    sim = Simulation(3, SimpleAgent(1), RandomAgent(2), 250, seed = 4, batchSize = 64)
+    simData = sim.run_simulation()
+    assert sim.run_simulation() == simData # Test Case 1
+    assert Simulation(3, SimpleAgent(1), RandomAgent(2), 250, workers = 2, seed = 4, batchSize = 64).run_simulation() == simData # Test Case 1
+    assert len(simData) == 250 and sum(sim.outcome_summary(simData)) == 250 # Test Case 2
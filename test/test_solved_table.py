@@ -0,0 +1,74 @@
+import pytest, sys, os, random
+sys.path.append(os.path.abspath(os.path.join("..", "src")))
+from SolvedTable import *
+from Agent import *
+
+def test_position_index():
+    '''
+    Purpose: Tests the base-3 ranking of positions.
+    Test Cases:
+        1. The empty board has index 0
+        2. Every cell contributes 3**idx for a cross and 2*3**idx for a nought
+    '''
+    b = Board()
+    assert position_index(b) == 0 # Test Case 1
+    b.update(1, (0,1))
+    b.update(2, (2,2))
+    assert position_index(b) == 3 + 2*3**8 # Test Case 2
+
+def test_solved_table(tmp_path):
+    '''
+    Purpose: Tests the solved table against the AlphaBetaMiniMaxAgent and its on-disk cache.
+    Test Cases:
+        1. The stored value of random positions matches the alpha beta search for both players
+        2. The stored best move achieves the stored value
+        3. The table file is written once and then reused
+    '''
+    path = str(tmp_path / "solved_3x3.bin")
+    table = load_table(path)
+    modifiedTime = os.path.getmtime(path)
+    for trial in range(200):
+        b = Board()
+        positions = random.sample(b.open_positions(), random.randint(0, 7))
+        for i, pos in enumerate(positions):
+            b.update(i%2+1, pos)
+        if(b.check_win()):
+            continue
+        for pNum in [1, 2]:
+            agent = AlphaBetaMiniMaxAgent(pNum)
+            value, bestPos = lookup(table, b, pNum)
+            assert agent.minimax(9, True, b, -999, 999)[0] == value # Test Case 1
+            b.push(pNum, bestPos)
+            assert agent.minimax(9, False, b, -999, 999)[0] == value # Test Case 2
+            b.pop()
+    load_table(path)
+    assert os.path.getmtime(path) == modifiedTime # Test Case 3
+    assert not [name for name in os.listdir(os.path.dirname(path)) if name.endswith(".tmp")] # the temporary file was moved into place
+
+def test_solved_table_agent(tmp_path):
+    '''
+    Purpose: Tests that the SolvedTableAgent blocks forced moves, never loses to a random agent and rejects boards it cannot solve.
+    '''
+    with pytest.raises(Exception):
+        SolvedTableAgent(pNum = 1, dim = 4)
+    agent1 = SolvedTableAgent(pNum = 1, cachePath = str(tmp_path / "solved_3x3.bin"))
+    agent2 = SolvedTableAgent(pNum = 2, cachePath = str(tmp_path / "solved_3x3.bin"))
+    b1 = Board()
+    b1.update(1, (0,0))
+    b1.update(2, (1,1))
+    b1.update(1, (0,1))
+    b1.update(2, (2,0))
+    assert agent1.get_position(b1, 5) == (0,2)
+    assert agent2.get_position(b1, 5) == (0,2)
+
+    for trial in range(20):
+        board = Board()
+        opponent = RandomAgent(pNum = 1)
+        curRound = 1
+        while(not board.check_win() and not board.is_full()):
+            if(curRound%2 == 1):
+                board.update(1, opponent.get_position(board, curRound))
+            else:
+                board.update(2, agent2.get_position(board, curRound))
+            curRound += 1
+        assert board.game_state() != 1
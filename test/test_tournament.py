@@ -0,0 +1,84 @@
+import pytest, sys, os, math, json
+sys.path.append(os.path.abspath(".."))
+sys.path.append(os.path.abspath(os.path.join("..", "src")))
+from Tournament import *
+
+def strip_seconds(results):
+    return sorted([{key: value for key, value in result.items() if key != "seconds"} for result in results], key = lambda result: sorted(result.items()))
+
+def test_schedule():
+    '''
+    Purpose: Tests the pairing schedule and the task list of a tournament.
+    Test Cases:
+        1. Every pair of agents plays in both seat orders on every board, except on boards an agent does not support
+        2. The pairings are split into tasks that cover every game once, most expensive first
+    '''
+    tournament = Tournament(["random", "simple", "solved"], [3, 4], gamesPerMatch = 25, taskSize = 10)
+    pairings = tournament.schedule()
+    assert len(pairings) == 6 + 2 # Test Case 1
+    assert ("random", "simple", 4) in pairings and ("simple", "random", 4) in pairings # Test Case 1
+    assert all(dim == 3 for agent1Name, agent2Name, dim in pairings if "solved" in [agent1Name, agent2Name]) # Test Case 1
+    tasks = Tournament(["random", "alphabeta"], [3], gamesPerMatch = 25, taskSize = 10).tasks()
+    assert sorted((task[3], task[4]) for task in tasks if task[:2] == ("random", "alphabeta")) == [(0, 10), (10, 10), (20, 5)] # Test Case 2
+    assert [task_cost(task) for task in tasks] == sorted([task_cost(task) for task in tasks], reverse = True) # Test Case 2
+    with pytest.raises(Exception):
+        make_agent("solved", 1, 4) # Test Case 1
+
+def test_fit_ratings():
+    '''
+    Purpose: Tests the Bradley-Terry ratings on results with known strengths.
+    Test Cases:
+        1. An agent that scores 3 out of 4 (ties counting half) is rated 400*log10(3) above its opponent, and the ratings average 1500
+        2. Three agents with strengths 1, 2 and 4 get ratings 400*log10(2) apart
+        3. An agent that wins every game gets a finite rating above the others
+    '''
+    results = [{"agent1": "a", "agent2": "b", "games": 40, "p1Wins": 25, "p2Wins": 5, "ties": 10},
+        {"agent1": "b", "agent2": "a", "games": 40, "p1Wins": 10, "p2Wins": 30, "ties": 0}]
+    ratings = fit_ratings(results, prior = 0)
+    assert math.isclose(ratings["a"] - ratings["b"], 400*math.log10(3), rel_tol = 1e-6) # Test Case 1
+    assert math.isclose(ratings["a"] + ratings["b"], 3000, rel_tol = 1e-9) # Test Case 1
+
+    strengths = {"a": 1, "b": 2, "c": 4}
+    results = []
+    for agent1Name in strengths:
+        for agent2Name in strengths:
+            if(agent1Name < agent2Name):
+                games = 600*(strengths[agent1Name] + strengths[agent2Name])
+                results.append({"agent1": agent1Name, "agent2": agent2Name, "games": games, "p1Wins": 600*strengths[agent1Name], "p2Wins": 600*strengths[agent2Name], "ties": 0})
+    ratings = fit_ratings(results, prior = 0)
+    assert math.isclose(ratings["b"] - ratings["a"], 400*math.log10(2), rel_tol = 1e-6) # Test Case 2
+    assert math.isclose(ratings["c"] - ratings["b"], 400*math.log10(2), rel_tol = 1e-6) # Test Case 2
+
+    ratings = fit_ratings([{"agent1": "a", "agent2": "b", "games": 10, "p1Wins": 10, "p2Wins": 0, "ties": 0}])
+    assert math.isfinite(ratings["a"]) and ratings["a"] > ratings["b"] # Test Case 3
+
+def test_tournament(tmp_path):
+    '''
+    Purpose: Tests running a tournament across processes and resuming it from a partial results file.
+    Test Cases:
+        1. A seeded tournament gives the same results with 1 or 2 workers
+        2. The perfect players are rated above the random agent, and the standings add up to the games played
+        3. A tournament resumed from a file with some tasks (and a line cut off) only plays the missing tasks and ends with the same results
+    '''
+    agentNames = ["random", "simple", "solved"]
+    serial = Tournament(agentNames, [3], gamesPerMatch = 20, seed = 5, taskSize = 10, cacheDir = str(tmp_path))
+    serialResults = serial.run()
+    assert len(serialResults) == 12
+    assert os.path.exists(tmp_path / "solved_3x3.bin") # the table is built in cacheDir instead of the home directory
+    parallel = Tournament(agentNames, [3], gamesPerMatch = 20, workers = 2, seed = 5, taskSize = 10, cacheDir = str(tmp_path))
+    assert strip_seconds(parallel.run()) == strip_seconds(serialResults) # Test Case 1
+
+    standings = serial.standings()
+    assert standings[0][0] == "solved" and standings[-1][0] == "random" # Test Case 2
+    assert sum(row[2] for row in standings) == 6*20 and all(row[3] == 4*20 for row in standings) # Test Case 2
+
+    # ---------- Test Case 3 ----------
+    path = str(tmp_path / "tournament.jsonl")
+    with open(path, "w") as f:
+        for result in serialResults[:5]:
+            f.write(json.dumps(result) + "\n")
+        f.write(json.dumps(serialResults[5])[:20])
+    resumed = Tournament(agentNames, [3], gamesPerMatch = 20, seed = 5, resultsPath = path, taskSize = 10, cacheDir = str(tmp_path))
+    assert strip_seconds(resumed.run()) == strip_seconds(serialResults)
+    fileResults = read_results(path)
+    assert len(fileResults) == 12 and fileResults[:5] == serialResults[:5] # only the 7 missing tasks were played and appended
@@ -0,0 +1,37 @@
+import pytest, sys, os, random
+sys.path.append(os.path.abspath(os.path.join("..", "src")))
+from TranspositionTable import *
+
+def test_lookup_and_store():
+    '''
+    Purpose: Tests the lookup() and store() functions of the TranspositionTable class.
+    Test Cases:
+        1. Looking up a missing key returns None and counts a miss
+        2. Looking up a stored key returns the entry and counts a hit
+        3. A shallower result does not overwrite a deeper one
+    '''
+    table = TranspositionTable(10)
+    assert table.lookup("a") == None # Test Case 1
+    table.store("a", 3, 1, Bound.EXACT, (0,0))
+    assert table.lookup("a") == (3, 1, Bound.EXACT, (0,0)) # Test Case 2
+    assert (table.hits, table.misses) == (1, 1)
+    assert table.hit_rate() == 0.5
+    table.store("a", 2, 0, Bound.LOWER, (1,1))
+    assert table.lookup("a") == (3, 1, Bound.EXACT, (0,0)) # Test Case 3
+    table.store("a", 4, 0, Bound.UPPER, (1,1))
+    assert table.lookup("a") == (4, 0, Bound.UPPER, (1,1)) # Test Case 3
+
+def test_lru_eviction():
+    '''
+    Purpose: Tests that the table never holds more than maxEntries positions and evicts the least recently used one.
+    '''
+    table = TranspositionTable(3)
+    for key in ["a", "b", "c"]:
+        table.store(key, 1, 0, Bound.EXACT, None)
+    table.lookup("a") # "b" is now the least recently used entry
+    table.store("d", 1, 0, Bound.EXACT, None)
+    assert len(table) == 3
+    assert table.lookup("b") == None
+    assert table.lookup("a") != None
+    table.clear()
+    assert len(table) == 0 and table.hits == 0 and table.misses == 0